@@ -0,0 +1,238 @@
+import os
+import json
+import time
+import queue
+import traceback
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import soundfile as sf
+from tts_generator import generate_long, SoundFileWriter
+from text_processor import load_text_file, apply_text_transformations
+from convert_worker import Mp3Stream, write_lockfile, load_outro_audio, convert_to_mp3, soundfile_args, wav_output_path, pick_device
+
+# Values of the shared abort flag
+RUNNING = 0
+PAUSE = 1  # Stop after the current batch and leave a lockfile to resume from
+STOP = 2  # Stop after the current batch without a lockfile
+
+# Per-process state of a pool worker, set up by _init_worker
+_progress_queue = None
+_abort_flag = None
+_device = None
+_pipeline = None
+
+
+def _init_worker(progress_queue, abort_flag, worker_counter, gpu_count, cpu_threads):
+    """Remember the shared progress queue and abort flag, limit CPU threads and pick this worker's device"""
+    global _progress_queue, _abort_flag, _device
+    _progress_queue = progress_queue
+    _abort_flag = abort_flag
+
+    # Split the cores between the workers instead of every worker's OpenMP/MKL pool claiming all of them.
+    # torch is only imported later in _get_pipeline, so its OpenMP and MKL runtimes still read these;
+    # NumPy's BLAS is already loaded by the module imports, so its thread count can't be changed here.
+    # _get_pipeline also passes the limit to torch.set_num_threads, which is what caps inference.
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS'):
+        os.environ[var] = str(cpu_threads)
+
+    # Spread workers over the available NVIDIA GPUs, or let them share the best other device
+    with worker_counter.get_lock():
+        worker_idx = worker_counter.value
+        worker_counter.value += 1
+    _device = f"cuda:{worker_idx % gpu_count}" if gpu_count > 0 else pick_device()
+
+
+def _get_pipeline(lang_code, cpu_int8=False):
+    """Load this worker's Kokoro pipeline once and reuse it for every book it converts"""
+    global _pipeline
+    if _pipeline is not None and _pipeline.lang_code == lang_code:
+        return _pipeline
+
+    # Import torch and KPipeline here so the pool itself starts quickly
+    import torch
+    from kokoro import KPipeline
+
+    print(f"Loading Kokoro pipeline on {_device} with language code '{lang_code}'...")
+    # Keep the model weights when only the language changes
+    model = _pipeline.model if _pipeline is not None else True
+    torch.set_num_threads(int(os.environ['OMP_NUM_THREADS']))
+    _pipeline = KPipeline(repo_id='hexgrad/Kokoro-82M', lang_code=lang_code, model=model, device=_device)
+    if model is True and _device == 'cpu' and cpu_int8:
+        torch.ao.quantization.quantize_dynamic(_pipeline.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    return _pipeline
+
+
+def _write_lockfile(input_path, chunk_idx, settings, error_message):
+    """Write a lockfile in the same format as the app so the book can be resumed later"""
+    failure_info = {
+        'failed_chunk_index': chunk_idx,
+        'error_message': error_message,
+        'voice': settings['voice'],
+        'speed': settings['speed'],
+        'sample_rate': settings['sample_rate'],
+        'convert_to_mp3': settings['convert_to_mp3'],
+        'mp3_bitrate': settings['mp3_bitrate'],
+        'timestamp': time.time()
+    }
+    try:
+        write_lockfile(input_path + ".lock", failure_info)
+        print(f"Lockfile created at {input_path}.lock")
+    except OSError as e:
+        print(f"Error creating lockfile: {e}")
+
+
+def _convert_one(index, input_path, output_path, cfg):
+    """Convert one book to speech inside a pool worker, returning its final output path or None if it was paused"""
+    # Books that had not started yet when the queue was paused are left untouched
+    if _abort_flag.value != RUNNING:
+        return None
+    _progress_queue.put(('started', index))
+
+    # Resume from a previous lockfile if there is one, using the settings it was started with
+    settings = dict(cfg)
+    start_chunk_idx = 0
+    lockfile_path = input_path + ".lock"
+    if os.path.exists(lockfile_path):
+        try:
+            with open(lockfile_path, 'r') as lf:
+                resume_info = json.load(lf)
+            for key in ('voice', 'speed', 'sample_rate', 'convert_to_mp3', 'mp3_bitrate'):
+                settings[key] = resume_info.get(key, settings[key])
+            start_chunk_idx = resume_info.get('failed_chunk_index', 0) or 0
+        except (json.JSONDecodeError, OSError) as e:
+            print(f"Warning: Error loading lockfile: {e}. Starting from beginning.")
+
+    # Always generate an intermediate WAV, even if the final destination is an MP3
+    output_path = wav_output_path(output_path)
+    sf_mode = 'r+' if start_chunk_idx > 0 and os.path.exists(output_path) else 'w'
+    if sf_mode == 'w':
+        start_chunk_idx = 0
+
+    text = load_text_file(input_path)
+    text = apply_text_transformations(
+        text,
+        settings['replace_newlines'] or None,
+        settings['merge_paragraphs'] or None
+    )
+
+    voice = settings['voice']
+    speed = float(settings['speed'])
+    sample_rate = int(settings['sample_rate'])
+    threshold = round(settings['threshold'], 2)
+    margin = int(settings['margin'] * sample_rate / 1000)  # Convert ms to samples based on sample rate
+    max_chunk_length = int(settings['max_chunk_length'])
+
+    pipeline = _get_pipeline(settings['lang_code'], settings['cpu_int8'])
+    voice_pack = pipeline.load_voice(voice)
+    if _device.startswith('cuda') and not voice_pack.is_pinned():
+        # Kokoro copies the pack to the GPU for every chunk; from pinned memory that is a direct DMA
+        voice_pack = voice_pack.pin_memory()
+        pipeline.voices[voice] = voice_pack
+    outro_audio = load_outro_audio(pipeline, voice_pack, settings['lang_code'], voice, speed, sample_rate, threshold, margin, max_chunk_length)
+
+    soundfile = sf.SoundFile(output_path, *soundfile_args(sf_mode, sample_rate))
+    # Encode the MP3 while synthesizing, starting with the audio a resumed book already has
+    mp3_path = os.path.splitext(output_path)[0] + ".mp3"
+    mp3_stream = Mp3Stream()
+    if settings['convert_to_mp3']:
+        mp3_stream.start(mp3_path, sample_rate, settings['mp3_bitrate'])
+        if sf_mode == 'r+':
+            mp3_stream.write_file(soundfile)
+    current_soundfile = SoundFileWriter(soundfile, mirror=mp3_stream.write)
+
+    current_chunk_idx = None
+    progress = generate_long(
+        [pipeline],
+        text,
+        current_soundfile,
+        output_path,
+        voice_pack,
+        time.time(),
+        start_chunk_idx,
+        sf_mode,
+        threshold,
+        margin,
+        speed,
+        sample_rate,
+        1,
+        max_chunk_length,
+        outro_audio=outro_audio,
+        half_precision=settings['half_precision'] and not (settings['cpu_int8'] and _device == 'cpu')
+    )
+    try:
+        for progress_info in progress:
+            current_chunk_idx = progress_info['processed_chunks'] - 1
+            _progress_queue.put(('progress', index, progress_info['processed_chunks'] / progress_info['total_chunks'], progress_info['progress_msg']))
+
+            if _abort_flag.value != RUNNING:
+                print(f"Conversion of {input_path} aborted by user")
+                progress.close()
+                current_soundfile.close()
+                mp3_stream.discard(mp3_path)
+                if _abort_flag.value == PAUSE:
+                    _write_lockfile(input_path, current_chunk_idx, settings, 'Interrupted by user/system shutdown')
+                return None
+    except Exception:
+        progress.close()
+        current_soundfile.close()
+        mp3_stream.discard(mp3_path)
+        if current_chunk_idx is not None:
+            _write_lockfile(input_path, current_chunk_idx, settings, traceback.format_exc())
+        raise
+
+    try:
+        os.remove(lockfile_path)
+    except OSError:
+        pass
+
+    if mp3_stream.finish():
+        return mp3_path
+    if settings['convert_to_mp3']:
+        try:
+            return convert_to_mp3(output_path, settings['mp3_bitrate'])
+        except Exception as e:
+            print(f"MP3 conversion failed, but WAV file was created successfully: {e}")
+    return output_path
+
+
+class ConvertPool:
+    """Converts several books at once, one book per worker process with its own Kokoro pipeline"""
+
+    def __init__(self, processes, gpu_count=0):
+        # Spawn fresh interpreters, since forking a process with Tk and CUDA state is unsafe
+        ctx = multiprocessing.get_context('spawn')
+        self.progress_queue = ctx.Queue()
+        self.abort_flag = ctx.Value('i', RUNNING)
+        cpu_threads = max(1, (os.cpu_count() or 1) // processes)
+        # Unlike multiprocessing.Pool, the executor notices a worker process dying (an OOM kill, a crash
+        # in native code) and fails the outstanding books with BrokenProcessPool instead of waiting forever
+        self.pool = ProcessPoolExecutor(
+            processes,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(self.progress_queue, self.abort_flag, ctx.Value('i', 0), gpu_count, cpu_threads)
+        )
+
+    def submit(self, index, input_path, output_path, cfg):
+        """Queue one book for conversion and return its Future"""
+        return self.pool.submit(_convert_one, index, input_path, output_path, cfg)
+
+    def abort(self, create_lockfile=True):
+        """Ask every worker to stop after its current batch"""
+        self.abort_flag.value = PAUSE if create_lockfile else STOP
+
+    def get_messages(self, timeout=0.2):
+        """Return the progress messages sent by the workers, waiting up to timeout for the first one"""
+        messages = []
+        try:
+            messages.append(self.progress_queue.get(timeout=timeout))
+            while True:
+                messages.append(self.progress_queue.get_nowait())
+        except queue.Empty:
+            pass
+        return messages
+
+    def close(self, wait=True):
+        """Shut the pool down, waiting for the workers to finish unless wait is False"""
+        # Books that haven't started are dropped when not waiting
+        self.pool.shutdown(wait=wait, cancel_futures=not wait)
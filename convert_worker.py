@@ -1,47 +1,263 @@
 import os
-import time
 import json
+import time
 import traceback
-import threading
-from tts_generator import generate_long
+import hashlib
+import tempfile
+import subprocess
+import functools
+from collections import OrderedDict
+from tts_generator import generate_long, process_chunk, get_resampler, SoundFileWriter
+from text_processor import split_text
 import soundfile as sf
-from pydub import AudioSegment
+import numpy as np
+
+# Read at the end of every audiobook. Its audio only depends on the voice and
+# synthesis settings, so it is cached on disk instead of synthesized per book.
+OUTRO_TEMPLATE = """We have now reached the end of your audiobook. This was read to you by Kokoro-82M using the {voice} voice, through Alexis Dumas's TTS program designed for long texts and reliability.
+
+Thank you!
+"""
+# Bump this whenever the outro text or the way it is synthesized changes
+OUTRO_CACHE_VERSION = 2
+OUTRO_CACHE_DIR = os.path.expanduser("~/.cache/kokoro-tts-gui/outro")
+# Outros already loaded in this process, keyed like the disk cache, in LRU order
+OUTRO_MEMORY_CACHE = OrderedDict()
+OUTRO_MEMORY_CACHE_SIZE = 8
+
+def write_lockfile(lockfile_path, failure_info):
+    """Atomically write a resume lockfile, so a crash mid-write never leaves a corrupt one behind"""
+    # Compact JSON goes through json's C encoder (indenting falls back to the pure Python one),
+    # and is handed to the file in one write; this runs on the shutdown and signal paths
+    data = json.dumps(failure_info, separators=(',', ':')).encode('utf-8')
+    temp_path = lockfile_path + ".tmp"
+    with open(temp_path, 'wb') as lf:
+        lf.write(data)
+        lf.flush()
+        os.fsync(lf.fileno())
+    os.replace(temp_path, lockfile_path)
+
+def pick_device():
+    """Fastest device available for Kokoro: an NVIDIA GPU, then Apple Silicon, then the CPU"""
+    import torch
+    if torch.cuda.is_available():
+        return 'cuda'
+    if torch.backends.mps.is_available():
+        return 'mps'
+    return 'cpu'
+
+def wav_output_path(output_path):
+    """Path of the WAV file synthesis writes to for an output path"""
+    # A WAV destination is written in place under the exact name the user picked, so it never needs moving afterwards
+    root, ext = os.path.splitext(output_path)
+    if ext.lower() == '.wav':
+        return output_path
+    return root + '.wav'
+
+@functools.lru_cache(maxsize=None)
+def soundfile_args(sf_mode, sample_rate):
+    """Positional SoundFile arguments after the path: resumed files keep their own format, new ones are mono 16-bit PCM"""
+    if sf_mode == 'r+':
+        return (sf_mode,)
+    return (sf_mode, sample_rate, 1, 'PCM_16')
+
+def mp3_quality_args(bitrate):
+    """ffmpeg arguments for an MP3 bitrate setting, where "auto" picks LAME's high quality VBR mode"""
+    if bitrate == "auto":
+        # VBR spends bits only where the audio needs them, which for speech with pauses is well below a fixed rate
+        return ['-q:a', '2']
+    return ['-b:a', bitrate]
+
+def convert_to_mp3(wav_path, bitrate="192k"):
+    """Convert WAV file to MP3 with specified bitrate"""
+    try:
+        print(f"Converting {wav_path} to MP3 with bitrate {bitrate}...")
+        
+        # Create MP3 filename
+        mp3_path = os.path.splitext(wav_path)[0] + ".mp3"
+        
+        # Let ffmpeg stream the WAV straight from disk instead of decoding it into memory first
+        subprocess.run([
+            'ffmpeg',
+            '-y',  # Overwrite a previous MP3
+            '-loglevel', 'error',
+            '-i', wav_path,
+            '-ac', '1',
+            *mp3_quality_args(bitrate),
+            '-f', 'mp3',
+            mp3_path
+        ], capture_output=True, text=True, check=True)
+        
+        print(f"Successfully converted to MP3: {mp3_path}")
+        return mp3_path
+        
+    except subprocess.CalledProcessError as e:
+        print(f"Error converting to MP3: {e.stderr}")
+        raise
+    except FileNotFoundError:
+        print("Error converting to MP3: ffmpeg is not installed or not available in PATH")
+        raise
+    except Exception as e:
+        print(f"Error converting to MP3: {e}")
+        raise
+
+def load_outro_audio(pipeline, voice_pack, lang_code, voice, speed, sample_rate, threshold, margin, max_chunk_length):
+    """Load the outro audio for these settings from the cache, synthesizing and caching it on a miss"""
+    cache_key = f"{OUTRO_CACHE_VERSION}|{lang_code}|{voice}|{speed}|{sample_rate}|{threshold}|{margin}|{max_chunk_length}"
+    if cache_key in OUTRO_MEMORY_CACHE:
+        # Converting several books in a row with the same settings doesn't read the file again
+        OUTRO_MEMORY_CACHE.move_to_end(cache_key)
+        return OUTRO_MEMORY_CACHE[cache_key]
+
+    cache_path = os.path.join(OUTRO_CACHE_DIR, hashlib.sha1(cache_key.encode('utf-8')).hexdigest() + ".wav")
+    try:
+        audio, _ = sf.read(cache_path, dtype='float32', always_2d=True)
+        print(f"Using cached outro audio: {cache_path}")
+        return remember_outro_audio(cache_key, audio)
+    except RuntimeError:
+        # Not cached yet (soundfile raises a RuntimeError subclass for missing files)
+        pass
+
+    print("Synthesizing outro audio...")
+    outro_chunks = [
+        process_chunk(pipeline, chunk, voice_pack, threshold=threshold, margin=margin, speed=speed, sample_rate=sample_rate)
+        for chunk in split_text(OUTRO_TEMPLATE.format(voice=voice), max_chunk_length)
+    ]
+    audio = np.concatenate([chunk for chunk in outro_chunks if chunk is not None])
+
+    temp_path = None
+    try:
+        os.makedirs(OUTRO_CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so a crash never leaves a truncated cache entry. Each call gets
+        # its own file, since parallel book workers with the same settings all miss the cache at once.
+        fd, temp_path = tempfile.mkstemp(dir=OUTRO_CACHE_DIR, suffix=".wav")
+        os.close(fd)
+        sf.write(temp_path, audio, sample_rate, subtype='FLOAT', format='WAV')
+        os.replace(temp_path, cache_path)
+    except (OSError, RuntimeError) as e:
+        print(f"Could not cache outro audio: {e}")
+        if temp_path is not None:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+    return remember_outro_audio(cache_key, audio)
+
+def remember_outro_audio(cache_key, audio):
+    """Keep outro audio in memory for later conversions in this process, evicting the least recently used"""
+    # Read-only, since the same array is written at the end of every book
+    audio.setflags(write=False)
+    OUTRO_MEMORY_CACHE[cache_key] = audio
+    if len(OUTRO_MEMORY_CACHE) > OUTRO_MEMORY_CACHE_SIZE:
+        OUTRO_MEMORY_CACHE.popitem(last=False)
+    return audio
+
+class Mp3Stream:
+    """ffmpeg process encoding raw PCM piped to it into an MP3 while synthesis runs"""
+
+    def __init__(self):
+        self.process = None
+
+    def start(self, mp3_path, sample_rate, bitrate="192k"):
+        """Start an ffmpeg process that encodes raw PCM piped to it into an MP3 while synthesis runs"""
+        try:
+            print(f"Streaming MP3 to {mp3_path} with bitrate {bitrate}...")
+            self.process = subprocess.Popen([
+                'ffmpeg',
+                '-y',  # Overwrite a previous MP3
+                '-loglevel', 'error',
+                '-f', 's16le',
+                '-ar', str(sample_rate),
+                '-ac', '1',
+                '-i', 'pipe:0',
+                *mp3_quality_args(bitrate),
+                '-f', 'mp3',
+                mp3_path
+            ], stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        except OSError as e:
+            print(f"Could not start MP3 stream, the WAV file will be converted afterwards instead: {e}")
+            self.process = None
+
+    def write(self, pcm):
+        """Feed a chunk of 16-bit PCM audio to the MP3 encoder (runs on the sound file writer thread)"""
+        process = self.process
+        if process is None:
+            return
+        try:
+            # Hand ffmpeg the array's own buffer instead of copying it into a bytes object first
+            process.stdin.write(memoryview(np.ascontiguousarray(pcm)).cast('B'))
+        except OSError as e:
+            print(f"MP3 stream failed, the WAV file will be converted afterwards instead: {e}")
+            self.stop()
+
+    def write_file(self, soundfile, blocksize=65536):
+        """Feed the audio already in an open sound file to the encoder, like the part of a resumed book written before"""
+        if self.process is None:
+            return
+        soundfile.seek(0)
+        # Block by block, so the existing audio never has to fit in memory at once
+        for block in soundfile.blocks(blocksize=blocksize, dtype='int16', always_2d=True):
+            self.write(block)
+
+    def finish(self):
+        """Close the MP3 encoder's input and wait for it, returning whether the MP3 is complete"""
+        process, self.process = self.process, None
+        if process is None:
+            return False
+        try:
+            process.stdin.close()
+        except OSError:
+            pass
+        return process.wait() == 0
+
+    def discard(self, mp3_path):
+        """Kill an unfinished MP3 stream and remove its partial output; the WAV is kept for resuming"""
+        if self.process is None:
+            return
+        self.stop()
+        try:
+            os.remove(mp3_path)
+        except OSError:
+            pass
+
+    def stop(self):
+        """Kill the MP3 encoder without finishing the file"""
+        process, self.process = self.process, None
+        if process is not None:
+            process.kill()
+            process.wait()
 
 class ConvertWorker:
     """Handles conversion of a single text file to speech"""
+
+    # Number of voice packs kept in memory before the least recently used is dropped
+    MAX_VOICE_PACKS = 16
     
     def __init__(self, app_instance, ui_callbacks=None):
         self.app = app_instance
         self.ui_callbacks = ui_callbacks or {}
         
-        # Create our own Kokoro pipelines based on batch count
+        # Our own Kokoro pipelines based on batch count, loaded on first use
         self.pipelines = []
+        # One CUDA stream per pipeline when the shared model runs on a GPU
+        self.streams = []
+        self.lang_code = self.app.language_codes.get(self.app.language_var.get(), 'a')
 
-        self.recreate_pipelines()
+        # Voice packs keyed by voice name, shared by all pipelines, in LRU order
+        self.voice_packs = OrderedDict()
+
+        # Encodes MP3 alongside synthesis when requested
+        self.mp3_stream = Mp3Stream()
+
+        # torch's own CPU thread count, restored when the CPU Threads setting is back on automatic
+        self.default_cpu_threads = None
             
     def convert_to_mp3(self, wav_path, bitrate="192k"):
         """Convert WAV file to MP3 with specified bitrate"""
-        try:
-            print(f"Converting {wav_path} to MP3 with bitrate {bitrate}...")
-            
-            # Load the WAV file
-            audio = AudioSegment.from_wav(wav_path)
-            
-            # Create MP3 filename
-            mp3_path = os.path.splitext(wav_path)[0] + ".mp3"
-            
-            # Export as MP3
-            audio.export(mp3_path, format="mp3", bitrate=bitrate)
-            
-            print(f"Successfully converted to MP3: {mp3_path}")
-            return mp3_path
-            
-        except Exception as e:
-            print(f"Error converting to MP3: {e}")
-            raise
-        
+        return convert_to_mp3(wav_path, bitrate)
+
     def convert_file(self, text_content, output_path):
-        output_path = os.path.splitext(output_path)[0]+'.wav' # in case the final destination file is mp3, we still wanna generate an intermediate wav 
+        output_path = wav_output_path(output_path) # in case the final destination file is mp3, we still wanna generate an intermediate wav 
         """Convert a single text file to speech"""
         try:
             print(f"Starting conversion worker")
@@ -56,49 +272,66 @@ class ConvertWorker:
             # Check if pipeline is loaded
             if not self.app.pipeline_loaded:
                 raise ValueError("Pipeline not loaded")
+            self.ensure_pipelines()
                 
             # Get selected voice (extract voice identifier without grade)
             voice_with_grade = self.app.voice_var.get()
             voice = voice_with_grade.split(" (")[0]  # Extract voice identifier before the grade
                         
-            # Use provided text content or read from file
-            text = text_content.strip() + f"""
+            # Use provided text content as is; split_text strips it, and the outro is appended as cached audio
+            text = text_content
 
-We have now reached the end of your audiobook. This was read to you by Kokoro-82M using the {voice} voice, through Alexis Dumas's TTS program designed for long texts and reliability.
-
-Thank you!
-"""
             # Get speed and sample rate from UI
-            speed = self.app.speed_var.get()
-            sample_rate = self.app.sample_rate_var.get()
+            # Snapshot them as plain numbers once instead of going through Tk for every use
+            speed = float(self.app.speed_var.get())
+            sample_rate = int(self.app.sample_rate_var.get())
+            threshold = round(self.app.threshold_var.get(), 2)
+            margin = int(self.app.margin_var.get() * sample_rate / 1000)  # Convert ms to samples based on sample rate
+            max_chunk_length = int(self.app.max_chunk_length_var.get())
+            sf_mode = self.app.sf_mode
+            start_chunk_idx = self.app.start_chunk_idx
+
+            outro_audio = self.get_outro_audio(voice, speed, sample_rate, threshold, margin, max_chunk_length)
             
             # Call generate_long with the required parameters
-            if self.app.sf_mode == 'r+':
-                self.app.current_soundfile = sf.SoundFile(output_path, self.app.sf_mode)
-            else:
-                self.app.current_soundfile = sf.SoundFile(output_path, self.app.sf_mode, sample_rate, 1, 'PCM_16')
+            soundfile = sf.SoundFile(output_path, *soundfile_args(sf_mode, sample_rate))
+            # Encode the MP3 while we synthesize. When resuming, the audio written before is
+            # streamed to the encoder first, so the WAV never needs a second full pass at the end.
+            mp3_path = os.path.splitext(output_path)[0] + ".mp3"
+            if self.app.convert_to_mp3_var.get():
+                self.mp3_stream.start(mp3_path, sample_rate, self.app.mp3_bitrate_var.get())
+                if sf_mode == 'r+':
+                    self.mp3_stream.write_file(soundfile)
+
+            # Disk writes happen on a background thread while the next batch is synthesized
+            self.app.current_soundfile = SoundFileWriter(soundfile, mirror=self.mp3_stream.write)
                 
             for progress_info in generate_long(
                     self.pipelines,  # Use our list of pipelines
                     text,
                     self.app.current_soundfile,
                     output_path, 
-                    voice,
+                    self.get_voice_pack(voice),  # Resolve the voice once instead of per chunk
                     start_time,
-                    self.app.start_chunk_idx,
-                    self.app.sf_mode,
-                    round(self.app.threshold_var.get(), 2),  # Pass threshold from UI slider
-                    int(self.app.margin_var.get() * sample_rate / 1000),  # Convert ms to samples based on sample rate
+                    start_chunk_idx,
+                    sf_mode,
+                    threshold,  # Pass threshold from UI slider
+                    margin,  # Pass margin in samples
                     speed,  # Pass speed from UI slider
                     sample_rate,  # Pass sample rate from UI spinner
                     len(self.pipelines),  # Pass the actual number of pipelines we have
-                    self.app.max_chunk_length_var.get()  # Pass max chunk length from UI spinner
+                    max_chunk_length,  # Pass max chunk length from UI spinner
+                    streams=self.streams,
+                    outro_audio=outro_audio,
+                    # INT8-quantized layers only take FP32 input, so the two CPU options don't mix
+                    half_precision=self.app.half_precision_var.get() and not (self.app.cpu_int8_var.get() and self.pipelines[0].model.device.type == 'cpu')
             ):
                 # Check if abort was requested
                 if self.app.app_state.is_aborted:
                     print("Conversion aborted by user")
                     # Cleanup with the appropriate lockfile setting
                     self.app._cleanup_on_exit()
+                    self.mp3_stream.discard(mp3_path)
                     return False
 
                 self.app.current_chunk_idx = progress_info['processed_chunks'] - 1
@@ -111,7 +344,10 @@ Thank you!
             
             # Check if MP3 conversion is requested
             final_output_path = output_path
-            if self.app.convert_to_mp3_var.get():
+            if self.mp3_stream.finish():
+                final_output_path = mp3_path
+                print(f"MP3 streaming completed: {final_output_path}")
+            elif self.app.convert_to_mp3_var.get():
                 try:
                     mp3_bitrate = self.app.mp3_bitrate_var.get()
                     final_output_path = self.convert_to_mp3(output_path, mp3_bitrate)
@@ -129,22 +365,124 @@ Thank you!
             # Set error state for cleanup
             self.app.app_state.set_state(self.app.app_state.ERROR)
             self.app._cleanup_on_exit()
+            self.mp3_stream.discard(os.path.splitext(output_path)[0] + ".mp3")
                                         
             # Update UI for error
             traceback.print_exc()
             if 'error_conversion' in self.ui_callbacks:
                 self.ui_callbacks['error_conversion'](str(e))
                 
-    def recreate_pipelines(self, lang_code='a'):
+    def get_outro_audio(self, voice, speed, sample_rate, threshold, margin, max_chunk_length):
+        """Load the outro audio for these settings from the cache, synthesizing and caching it on a miss"""
+        return load_outro_audio(self.pipelines[0], self.get_voice_pack(voice), self.lang_code, voice, speed, sample_rate, threshold, margin, max_chunk_length)
+
+    def prewarm(self, voice):
+        """Load the pipelines and synthesize a few words, so lazy initialization and kernel autotuning happen up front"""
+        import torch
+        pipeline = self.ensure_pipelines()[0]
+        print("Warming up Kokoro model...")
+        with torch.inference_mode():
+            next(pipeline("Warming up.", voice=self.get_voice_pack(voice)))
+        # Build the accelerator's resampling kernel now too, rather than on the first chunk of a conversion;
+        # the CPU path uses soxr, which has no kernel to keep
+        sample_rate = self.app.sample_rate_var.get()
+        if sample_rate != 24000 and pipeline.model.device.type != 'cpu':
+            get_resampler(sample_rate, pipeline.model.device)
+        print("Kokoro model warmed up")
+
+    def apply_cpu_threads(self):
+        """Limit torch's CPU threads to the CPU Threads setting, where 0 splits torch's default of one per core between batch slots"""
+        import torch
+        if self.default_cpu_threads is None:
+            self.default_cpu_threads = torch.get_num_threads()
+        # Every batch slot thread that calls into torch starts its own team of this many OpenMP threads,
+        # so N slots each using every core would oversubscribe the CPU N times over
+        threads = self.app.cpu_threads_var.get() or max(1, self.default_cpu_threads // self.app.batch_count_var.get())
+        if torch.get_num_threads() != threads:
+            torch.set_num_threads(threads)
+
+    def ensure_pipelines(self):
+        """Load the pipelines the first time they are actually needed"""
+        self.apply_cpu_threads()
+        if not self.pipelines:
+            self.recreate_pipelines(self.lang_code)
+        return self.pipelines
+
+    def unload_pipelines(self):
+        """Drop the pipelines and model so the next use loads them again with the current settings"""
+        self.pipelines = []
+        self.streams = []
+
+    def set_language(self, lang_code):
+        """Switch language, reloading the pipelines only if they have already been loaded"""
+        self.lang_code = lang_code
+        if self.pipelines:
+            self.recreate_pipelines(lang_code)
+
+    def get_voice_pack(self, voice):
+        """Load a voice pack once and reuse it for every chunk and pipeline"""
+        if voice in self.voice_packs:
+            self.voice_packs.move_to_end(voice)
+            return self.voice_packs[voice]
+
+        # Kokoro reads the pack from the Hugging Face cache on disk, so only the decoded tensor is kept here
+        pipeline = self.ensure_pipelines()[0]
+        voice_pack = pipeline.load_voice(voice)
+        # The pipeline keeps its own copy too, which would defeat the eviction below
+        pipeline.voices.pop(voice, None)
+        if pipeline.model.device.type == 'cuda':
+            # Kokoro copies the pack to the GPU for every chunk; from pinned memory that is a direct DMA
+            voice_pack = voice_pack.pin_memory()
+
+        self.voice_packs[voice] = voice_pack
+        if len(self.voice_packs) > self.MAX_VOICE_PACKS:
+            self.voice_packs.popitem(last=False)
+        return voice_pack
+
+    def use_sdpa_attention(self, model):
+        """Make sure Kokoro's ALBERT encoder uses fused scaled_dot_product_attention instead of eager attention"""
+        bert = model.bert
+        if getattr(bert, 'attn_implementation', None) == 'sdpa':
+            # Recent transformers versions already pick SDPA by default
+            return
+        try:
+            from transformers.models.albert.modeling_albert import AlbertAttention, AlbertSdpaAttention
+        except ImportError:
+            print("This transformers version has no SDPA attention for ALBERT, keeping eager attention")
+            return
+
+        # The SDPA attention subclass has exactly the same weights, so swap the class in place
+        for module in bert.modules():
+            if type(module) is AlbertAttention:
+                module.__class__ = AlbertSdpaAttention
+                module.dropout_prob = bert.config.attention_probs_dropout_prob
+                module.require_contiguous_qkv = True
+        # Have the encoder build the attention mask in the layout SDPA expects
+        bert.attn_implementation = 'sdpa'
+        print("Switched Kokoro's ALBERT encoder to SDPA attention")
+
+    def recreate_pipelines(self, lang_code=None):
         """Recreate pipelines based on updated batch count and language"""
         # Import KPipeline here to avoid slowing down app startup
+        import torch
         from kokoro import KPipeline
         
+        if lang_code is None:
+            lang_code = self.lang_code
+        self.lang_code = lang_code
+
         # Create new pipelines based on batch count
         batch_count = self.app.batch_count_var.get()
         print(f"Recreating {batch_count} Kokoro pipeline(s) for ConvertWorker with language code '{lang_code}'...")
+
+        # KModel is language-blind, so keep the already loaded weights around
+        # and share them between every batch slot instead of loading N copies
+        model = self.pipelines[0].model if self.pipelines else True
+        loading_model = model is True
         self.pipelines = []
-        
+        # Kokoro only picks CUDA by itself, so choose the device here to use Apple Silicon GPUs too
+        device = pick_device() if loading_model else None
+
         try:
             for i in range(batch_count):
                 print(f"Loading pipeline {i+1}/{batch_count}...")
@@ -152,9 +490,42 @@ Thank you!
                 if 'update_progress' in self.ui_callbacks:
                     progress_msg = f"Loading pipeline {i+1}/{batch_count}..."
                     self.ui_callbacks['update_progress'](progress_msg=progress_msg, progress_value=(i + 1) / batch_count)
-                pipeline = KPipeline(repo_id='hexgrad/Kokoro-82M', lang_code=lang_code)
+                pipeline = KPipeline(repo_id='hexgrad/Kokoro-82M', lang_code=lang_code, model=model, device=device)
+                # Every following pipeline only gets its own text frontend
+                model = pipeline.model
                 self.pipelines.append(pipeline)
             
+            if loading_model:
+                print(f"Kokoro model loaded on {model.device}")
+                self.use_sdpa_attention(model)
+
+            # Quantize freshly loaded weights to INT8 for the CPU path if requested
+            if loading_model and model.device.type == 'cpu' and self.app.cpu_int8_var.get():
+                print("Quantizing Kokoro linear layers to INT8 for CPU inference...")
+                torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+            # Compile the tensor half of the forward pass on CUDA. Compilation isn't thread-safe,
+            # so it is only used while a single batch slot drives the model.
+            compiled = 'forward_with_tokens' in vars(model)
+            use_compile = self.app.compile_model_var.get() and model.device.type == 'cuda' and batch_count == 1
+            if use_compile and not compiled:
+                print("Compiling Kokoro model with torch.compile...")
+                # Compilation only happens on the first call, so a missing Triton or C++ compiler would
+                # otherwise fail every chunk; fall back to running those graphs eagerly instead
+                torch._dynamo.config.suppress_errors = True
+                # Plain 'default' mode on purpose: 'reduce-overhead' records a CUDA graph per chunk length,
+                # and with every chunk a different length that only costs memory
+                model.forward_with_tokens = torch.compile(model.forward_with_tokens, dynamic=True)
+            elif compiled and not use_compile:
+                # Drop the instance attribute to fall back to the eager method
+                del model.forward_with_tokens
+
+            # Give each batch slot its own CUDA stream so their work can overlap on the shared model
+            if batch_count > 1 and model.device.type == 'cuda':
+                self.streams = [torch.cuda.Stream(device=model.device) for _ in range(batch_count)]
+            else:
+                self.streams = []
+
             print(f"All {batch_count} Kokoro pipeline(s) recreated for ConvertWorker with language code '{lang_code}'")
         except Exception as e:
             # Handle pipeline loading errors
@@ -4,17 +4,22 @@ import json
 import atexit
 import re
 
-# Check if we're already running with correct FFmpeg path and restart if needed
+# Make Homebrew's ffmpeg 6 libraries available to torchaudio on macOS. run.sh puts them on
+# DYLD_LIBRARY_PATH before Python starts; otherwise load them by absolute path right away, so
+# later lookups by library name find them already loaded instead of needing a re-exec.
 ffmpeg_lib_path = '/opt/homebrew/opt/ffmpeg@6/lib'
 current_dyld_path = os.environ.get('DYLD_LIBRARY_PATH', '')
 
-if ffmpeg_lib_path not in current_dyld_path:
-    # Restart script with correct environment
-    new_env = os.environ.copy()
-    new_env['DYLD_LIBRARY_PATH'] = f"{ffmpeg_lib_path}:{current_dyld_path}" if current_dyld_path else ffmpeg_lib_path
-    
-    # Restart the script with correct environment
-    os.execvpe(sys.executable, [sys.executable] + sys.argv, new_env)
+if sys.platform == 'darwin' and os.path.isdir(ffmpeg_lib_path) and ffmpeg_lib_path not in current_dyld_path:
+    import ctypes
+    import glob
+    # Dependencies first, so each library's own imports are already resolved
+    for lib_name in ('avutil', 'swresample', 'swscale', 'avcodec', 'avformat', 'avfilter', 'avdevice'):
+        for lib_path in sorted(glob.glob(os.path.join(ffmpeg_lib_path, f"lib{lib_name}.*.dylib"))):
+            try:
+                ctypes.CDLL(lib_path, mode=ctypes.RTLD_GLOBAL)
+            except OSError as e:
+                print(f"Could not preload {lib_path}: {e}")
 
 # Suppress torch warnings before importing any modules that might import torch
 import warnings
@@ -22,10 +27,11 @@ warnings.filterwarnings("ignore", module="torch")
 warnings.filterwarnings("ignore", category=UserWarning, module="torch")
 warnings.filterwarnings("ignore", category=FutureWarning, module="torch")
 
+# Let the few operations Kokoro uses that MPS lacks fall back to the CPU on Apple Silicon
+os.environ.setdefault('PYTORCH_ENABLE_MPS_FALLBACK', '1')
+
 import time
 import signal
-import tempfile
-import simpleaudio as sa
 import tkinter as tk
 from tkinter import filedialog, messagebox, ttk
 import subprocess
@@ -40,36 +46,80 @@ except ImportError:
     print("tkinterdnd2-universal not available, drag-and-drop support will be limited")
 
 import threading
-import numpy as np
-import soundfile as sf
+import importlib
+from collections import deque
 from typing import Optional
 
-# Import our new modules
-from tts_generator import process_chunk, generate_long
-from queue_worker import QueueWorker
-from convert_worker import ConvertWorker
-from text_processor import clean_unicode_text, apply_text_transformations
+# Only light modules are imported up front so the window appears right away. The conversion
+# modules pull in numpy, soundfile and NLTK; they're imported where they're used, and the
+# pipeline loading thread imports them in the background right after start-up.
 from voices import VOICE_DATA
 
-class ToolTip:
-    """A tooltip class for tkinter widgets based on the GeeksforGeeks approach"""
+# Kokoro language codes by the language names shown in the UI
+LANGUAGE_CODES = {
+    "American English": "a",
+    "British English": "b",
+    "Japanese": "j",
+    "Mandarin Chinese": "z",
+    "Spanish": "e",
+    "French": "f",
+    "Hindi": "h",
+    "Italian": "i",
+    "Brazilian Portuguese": "p"
+}
+
+# Voice list with grades for display
+VOICES_WITH_GRADES = tuple(f"{voice} ({data.grade})" for voice, data in VOICE_DATA.items())
+
+# The same list split up by Kokoro language code, so switching languages doesn't filter all voices
+VOICES_BY_LANG_CODE = {
+    lang_code: tuple(voice for voice, data in zip(VOICES_WITH_GRADES, VOICE_DATA.values()) if data.lang_code == lang_code)
+    for lang_code in {data.lang_code for data in VOICE_DATA.values()}
+}
+
+# MP3 bitrates offered for conversion, where "auto" encodes with variable bitrate
+MP3_BITRATES = ("auto", "64k", "96k", "128k", "192k", "256k", "320k")
+
+# Input file types accepted by drag and drop
+SUPPORTED_INPUT_EXTENSIONS = frozenset(('.txt', '.epub', '.html', '.htm', '.pdf', '.docx', '.md', '.rtf'))
+
+# Minimum time between two progress display refreshes (4 per second)
+PROGRESS_UPDATE_INTERVAL_NS = 250_000_000
+
+# Characters handed to the editor per insert when loading a file
+EDITOR_INSERT_CHUNK = 1 << 20
+
+# Number of logical CPUs, which caps the parallelism settings
+CPU_COUNT = os.cpu_count() or 1
+
+class TooltipManager:
+    """Tooltips for any number of widgets, served by one set of application-wide event bindings"""
     
-    def __init__(self, widget, text, delay=1000):
-        self.widget = widget
-        self.text = text
+    def __init__(self, root, delay=1000):
+        self.root = root
         self.delay = delay
+        # Tooltip text by widget path name
+        self.texts = {}
+        self.widget = None
         self.tooltip_window = None
+        self.label = None
+        self.tooltip_visible = False
         self.id = None
-        self.x = self.y = 0
         
-        # Bind events
-        self.widget.bind("<Enter>", self.on_enter, add="+")
-        self.widget.bind("<Leave>", self.on_leave, add="+")
-        self.widget.bind("<ButtonPress>", self.on_leave, add="+")
+        # Every widget has the "all" bind tag, so these three bindings cover all of them
+        self.root.bind_all("<Enter>", self.on_enter, add="+")
+        self.root.bind_all("<Leave>", self.on_leave, add="+")
+        self.root.bind_all("<ButtonPress>", self.on_leave, add="+")
+        
+    def attach(self, widget, text):
+        """Show text as the tooltip of widget"""
+        self.texts[str(widget)] = text
         
-    def on_enter(self, event=None):
+    def on_enter(self, event):
         """Handle mouse enter event"""
-        self.schedule()
+        if str(event.widget) in self.texts:
+            self.widget = event.widget
+            self.schedule()
         
     def on_leave(self, event=None):
         """Handle mouse leave event"""
@@ -79,42 +129,44 @@ class ToolTip:
     def schedule(self):
         """Schedule tooltip to appear after delay"""
         self.unschedule()
-        self.id = self.widget.after(self.delay, self.show_tooltip)
+        self.id = self.root.after(self.delay, self.show_tooltip)
         
     def unschedule(self):
         """Cancel scheduled tooltip"""
         if self.id:
-            self.widget.after_cancel(self.id)
+            self.root.after_cancel(self.id)
             self.id = None
             
     def show_tooltip(self):
         """Display the tooltip"""
+        self.id = None
+        text = self.texts.get(str(self.widget))
         # Don't show tooltip if there's no text
-        if not self.text:
+        if not text:
             return
             
         # Get mouse position
         x, y = self.widget.winfo_pointerxy()
         
-        # Create tooltip window
-        self.tooltip_window = tw = tk.Toplevel(self.widget)
-        tw.wm_overrideredirect(True)
+        # Create the tooltip window the first time it is needed, then reuse it for every tooltip
+        if self.tooltip_window is None:
+            self.tooltip_window = tk.Toplevel(self.root)
+            self.tooltip_window.wm_overrideredirect(True)
+            self.label = tk.Label(self.tooltip_window)
+            self.label.pack(ipadx=1)
         
         # Position tooltip near mouse cursor
-        tw.wm_geometry(f"+{x + 10}+{y + 10}")
-        
-        # Create tooltip label
-        label = tk.Label(
-            tw, 
-            text=self.text,
-        )
-        label.pack(ipadx=1)
+        self.label.config(text=text)
+        self.tooltip_window.wm_geometry(f"+{x + 10}+{y + 10}")
+        self.tooltip_window.deiconify()
+        self.tooltip_visible = True
         
     def hide_tooltip(self):
         """Hide the tooltip"""
-        if self.tooltip_window:
-            self.tooltip_window.destroy()
-            self.tooltip_window = None
+        # Every leave and click anywhere in the app lands here, so only touch the window if it is shown
+        if self.tooltip_visible:
+            self.tooltip_window.withdraw()
+            self.tooltip_visible = False
 
 
 class DnDEntry(ttk.Entry):
@@ -138,25 +190,22 @@ class DnDEntry(ttk.Entry):
         data = event.data
         if data:
             # Handle multiple files if needed, but we only care about the first one
-            # On Windows, paths might be enclosed in curly braces
-            # On Unix-like systems, paths are separated by spaces
-            # But paths with spaces might be quoted
+            # TkDnD sends a Tcl list: paths are separated by spaces and paths
+            # containing spaces are enclosed in curly braces
             
-            # Try to parse the data as a list of file paths
+            # Let Tcl's own list parser split it, in C and without a shlex tokenizer pass
             try:
-                import shlex
-                file_paths = shlex.split(data)
-            except:
+                file_paths = self.tk.splitlist(data)
+            except tk.TclError:
                 # Fallback: treat as a single file path
                 file_paths = [data]
                 
             if file_paths:
                 file_path = file_paths[0]  # Take the first file
                 # Check if file has a supported extension
-                supported_extensions = {'.txt', '.epub', '.html', '.htm', '.pdf', '.docx', '.md', '.rtf'}
                 file_ext = os.path.splitext(file_path)[1].lower()
                 
-                if os.path.isfile(file_path) and file_ext in supported_extensions:
+                if os.path.isfile(file_path) and file_ext in SUPPORTED_INPUT_EXTENSIONS:
                     print(f"Dropped input file: {file_path}")
                     self.app.input_path_var.set(file_path)
                     
@@ -177,6 +226,9 @@ class AppState:
     PROCESSING = "PROCESSING"
     ERROR = "ERROR"
     STOP = "STOP"
+    # State groups, built once since is_aborted is checked after every chunk
+    ABORTED_STATES = frozenset((ERROR, STOP))
+    LOCKFILE_STATES = frozenset((PROCESSING, ERROR))
     
     def __init__(self, initial_state=None, wait_for_worker_callback=None):
         self._state = initial_state or self.IDLE
@@ -193,8 +245,8 @@ class AppState:
         self._state = new_state
         
         # If transitioning to ERROR or STOP on main thread, call wait_for_worker
-        if (new_state in (self.ERROR, self.STOP) and 
-            old_state not in (self.ERROR, self.STOP) and
+        if (new_state in self.ABORTED_STATES and 
+            old_state not in self.ABORTED_STATES and
             self._wait_for_worker_callback is not None and
             threading.get_ident() == self._main_thread_id):
             print(f"State changed to {new_state} on main thread, waiting for worker...")
@@ -218,12 +270,12 @@ class AppState:
     @property
     def should_create_lockfile(self):
         """True if state should create a lockfile on exit"""
-        return self._state in (self.PROCESSING, self.ERROR)
+        return self._state in self.LOCKFILE_STATES
     
     @property
     def is_aborted(self):
         """True if state represents an aborted process"""
-        return self._state in (self.ERROR, self.STOP)
+        return self._state in self.ABORTED_STATES
 
 
 class TextToSpeechApp:
@@ -247,6 +299,15 @@ class TextToSpeechApp:
         self.current_soundfile = None
         self.current_chunk_idx = None
         self.start_time = None
+        
+        # When the progress display was last refreshed, to rate-limit updates from workers
+        self.last_progress_ns = 0
+        
+        # The open pause/stop confirmation window, if any
+        self.confirm_window = None
+        
+        # Whether the widgets are currently set up for an active conversion (None until first set)
+        self.ui_state_active = None
 
         # For Resume handling
         self.start_chunk_idx = 0
@@ -254,6 +315,9 @@ class TextToSpeechApp:
         
         # Track conversion state with atomic state management
         self.convert_worker_thread = None
+        # Set whenever no worker thread is running; cleared while one is
+        self._worker_done = threading.Event()
+        self._worker_done.set()
         self.app_state = AppState(wait_for_worker_callback=self._wait_for_worker)
         
         # Text editor state
@@ -261,6 +325,7 @@ class TextToSpeechApp:
         
         # Queue management
         self.queue_items = []  # List of dictionaries with input_file, output_file, status
+        self.queue_item_ids = []  # Treeview item id of each queue item, so rows are found without scanning the tree
         self.current_queue_index = -1  # Index of currently processing queue item
         
         # Recent files and settings
@@ -273,13 +338,19 @@ class TextToSpeechApp:
         # Handle window close event
         self.root.protocol("WM_DELETE_WINDOW", self._on_closing)
         
+        # Pending root.after ids of debounced callbacks, by key
+        self.debounce_ids = {}
+        # Last text shown by each slider value label
+        self.label_texts = {}
+        
         # Create UI elements
+        self.tooltips = TooltipManager(self.root)
         self.create_widgets()
         
         # Load settings after creating widgets
         self.load_settings()
         
-        self.root.update()
+        self.root.update_idletasks()
         self.root.lift()
         
         # No initialization needed for playsound
@@ -332,34 +403,27 @@ class TextToSpeechApp:
         file_frame = ttk.LabelFrame(parent, text="File Settings", padding="10")
         file_frame.pack(fill="x", pady=(0, 10))
         
-        # Input file section
+        # Input file section, gridded in a single frame rather than nesting a frame per row
         input_frame = ttk.Frame(file_frame)
         input_frame.pack(fill="x", pady=(0, 5))
+        input_frame.columnconfigure(0, weight=1)
         
-        ttk.Label(input_frame, text="Input Text File:").pack(anchor="w")
-        
-        input_row_frame = ttk.Frame(input_frame)
-        input_row_frame.pack(fill="x", pady=(5, 0))
-        input_row_frame.columnconfigure(0, weight=1)
+        ttk.Label(input_frame, text="Input Text File:").grid(row=0, column=0, columnspan=3, sticky="w")
         
         self.input_path_var = tk.StringVar()
-        self.input_entry = DnDEntry(input_row_frame, self, textvariable=self.input_path_var, state="readonly")
-        self.input_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
-        ToolTip(self.input_entry, "The text file to convert to speech. Must be a plain text file. The file will be processed in sentence chunks for long-form reliability. You can also drag and drop a text file here.")
+        self.input_entry = DnDEntry(input_frame, self, textvariable=self.input_path_var, state="readonly")
+        self.input_entry.grid(row=1, column=0, sticky="ew", padx=(0, 5), pady=(5, 0))
+        self.tooltips.attach(self.input_entry, "The text file to convert to speech. Must be a plain text file. The file will be processed in sentence chunks for long-form reliability. You can also drag and drop a text file here.")
         
-        # Create a frame for the browse and recent buttons
-        button_frame = ttk.Frame(input_row_frame)
-        button_frame.pack(side="left")
-        
-        self.browse_input_btn = ttk.Button(button_frame, text="Browse", command=self.browse_input_file)
-        self.browse_input_btn.pack(side="left", padx=(0, 5))
-        ToolTip(self.browse_input_btn, "Select a text file to convert to speech.")
+        self.browse_input_btn = ttk.Button(input_frame, text="Browse", command=self.browse_input_file)
+        self.browse_input_btn.grid(row=1, column=1, padx=(0, 5), pady=(5, 0))
+        self.tooltips.attach(self.browse_input_btn, "Select a text file to convert to speech.")
         
         # Recent files dropdown menu
-        self.recent_menu = tk.Menu(button_frame, tearoff=0)
-        self.recent_btn = ttk.Menubutton(button_frame, text="Recent", menu=self.recent_menu)
-        self.recent_btn.pack(side="left")
-        ToolTip(self.recent_btn, "Open a recently used text file.")
+        self.recent_menu = tk.Menu(input_frame, tearoff=0)
+        self.recent_btn = ttk.Menubutton(input_frame, text="Recent", menu=self.recent_menu)
+        self.recent_btn.grid(row=1, column=2, pady=(5, 0))
+        self.tooltips.attach(self.recent_btn, "Open a recently used text file.")
         
         # Update the recent files menu
         self.update_recent_files_menu()
@@ -376,7 +440,7 @@ class TextToSpeechApp:
             command=self.toggle_text_editor
         )
         self.editor_toggle_btn.pack(anchor="w")
-        ToolTip(self.editor_toggle_btn, "Toggle the text editor to view and edit the content that will be processed.")
+        self.tooltips.attach(self.editor_toggle_btn, "Toggle the text editor to view and edit the content that will be processed.")
         
         # Editor content frame (initially hidden)
         self.editor_content_frame = ttk.Frame(self.editor_frame)
@@ -393,7 +457,7 @@ class TextToSpeechApp:
         
         self.editor_text.pack(side="left", fill="both", expand=True)
         editor_scrollbar.pack(side="right", fill="y")
-        ToolTip(self.editor_text, "Edit the text content that will be processed by the TTS engine. Changes here will be used for conversion, even if not saved to the file. Use Ctrl+S or the Save button to save changes to the original file.")
+        self.tooltips.attach(self.editor_text, "Edit the text content that will be processed by the TTS engine. Changes here will be used for conversion, even if not saved to the file. Use Ctrl+S or the Save button to save changes to the original file.")
         
         # Editor controls
         editor_controls_frame = ttk.Frame(self.editor_content_frame)
@@ -408,7 +472,7 @@ class TextToSpeechApp:
             command=self.toggle_newline_replacement
         )
         self.replace_newlines_checkbox.pack(anchor="w", pady=(0, 5))
-        ToolTip(self.replace_newlines_checkbox, "Replace single newlines with spaces while preserving double newlines. Useful for cleaning up text formatting.")
+        self.tooltips.attach(self.replace_newlines_checkbox, "Replace single newlines with spaces while preserving double newlines. Useful for cleaning up text formatting.")
         
         # Checkbox for merging accidentally split paragraphs
         self.merge_paragraphs_var = tk.BooleanVar(value=False)
@@ -419,7 +483,7 @@ class TextToSpeechApp:
             command=self.toggle_merge_paragraphs
         )
         self.merge_paragraphs_checkbox.pack(anchor="w", pady=(0, 5))
-        ToolTip(self.merge_paragraphs_checkbox, "Merge paragraphs that were accidentally split. Detects lines ending without punctuation, followed by two newlines, followed by a line not starting with capital/number/dash.")
+        self.tooltips.attach(self.merge_paragraphs_checkbox, "Merge paragraphs that were accidentally split. Detects lines ending without punctuation, followed by two newlines, followed by a line not starting with capital/number/dash.")
         
         # Checkbox for converting math formulas and tables to verbal descriptions
         self.convert_math_var = tk.BooleanVar(value=False)
@@ -430,10 +494,11 @@ class TextToSpeechApp:
             command=self.toggle_math_conversion
         )
         self.convert_math_checkbox.pack(anchor="w", pady=(0, 5))
-        ToolTip(self.convert_math_checkbox, "Use microsoft/Phi-4-mini-instruct to convert mathematical formulas and tables into verbal descriptions for better TTS conversion.")
+        self.tooltips.attach(self.convert_math_checkbox, "Use microsoft/Phi-4-mini-instruct to convert mathematical formulas and tables into verbal descriptions for better TTS conversion.")
         
-        # Store converted text for reversible conversion
+        # Store converted text for reversible conversion, and the text it was converted from
         self.converted_text_content = ""
+        self.converted_source_content = ""
                 
         # Search controls
         search_frame = ttk.Frame(editor_controls_frame)
@@ -444,15 +509,15 @@ class TextToSpeechApp:
         self.search_var = tk.StringVar()
         self.search_entry = ttk.Entry(search_frame, textvariable=self.search_var, width=20)
         self.search_entry.pack(side="left", padx=(5, 5))
-        ToolTip(self.search_entry, "Enter text to search for in the editor")
+        self.tooltips.attach(self.search_entry, "Enter text to search for in the editor")
         
         self.search_btn = ttk.Button(search_frame, text="Find", command=self.find_text)
         self.search_btn.pack(side="left", padx=(0, 5))
-        ToolTip(self.search_btn, "Find the next occurrence of the search text")
+        self.tooltips.attach(self.search_btn, "Find the next occurrence of the search text")
         
         self.search_prev_btn = ttk.Button(search_frame, text="Find Previous", command=self.find_previous_text)
         self.search_prev_btn.pack(side="left")
-        ToolTip(self.search_prev_btn, "Find the previous occurrence of the search text")
+        self.tooltips.attach(self.search_prev_btn, "Find the previous occurrence of the search text")
         
         # Bind Enter key to search
         self.search_entry.bind('<Return>', lambda event: self.find_text())
@@ -460,15 +525,15 @@ class TextToSpeechApp:
         
         self.save_editor_btn = ttk.Button(editor_controls_frame, text="Save to File", command=self.save_editor_content)
         self.save_editor_btn.pack(anchor="w")
-        ToolTip(self.save_editor_btn, "Save the edited content back to the original file.")
+        self.tooltips.attach(self.save_editor_btn, "Save the edited content back to the original file.")
         
         # Bind Ctrl+S to save
         self.editor_text.bind('<Control-s>', lambda event: self.save_editor_content())
         self.editor_text.bind('<Command-s>', lambda event: self.save_editor_content())  # For Mac
         
-        # Bind events to track changes
-        self.editor_text.bind('<KeyPress>', self.on_text_editor_change)
-        self.editor_text.bind('<Button-1>', self.on_text_editor_change)
+        # Track changes through Tk's modified flag, which notifies us once when the text first
+        # changes instead of on every key press and click
+        self.editor_text.bind('<<Modified>>', self.on_text_editor_change)
         
         # Store original text for undoing newline replacement
         self.original_text_content = ""
@@ -481,21 +546,18 @@ class TextToSpeechApp:
         # Output file section
         output_frame = ttk.Frame(file_frame)
         output_frame.pack(fill="x", pady=(10, 0))
+        output_frame.columnconfigure(0, weight=1)
         
-        ttk.Label(output_frame, text="Output Audio File:").pack(anchor="w")
-        
-        output_row_frame = ttk.Frame(output_frame)
-        output_row_frame.pack(fill="x", pady=(5, 0))
-        output_row_frame.columnconfigure(0, weight=1)
+        ttk.Label(output_frame, text="Output Audio File:").grid(row=0, column=0, columnspan=2, sticky="w")
         
         self.output_path_var = tk.StringVar()
-        self.output_entry = ttk.Entry(output_row_frame, textvariable=self.output_path_var)
-        self.output_entry.pack(side="left", fill="x", expand=True, padx=(0, 5))
-        ToolTip(self.output_entry, "The output audio file. Will be created in WAV or MP3 format. For MP3 output, an intermediate WAV file is first created to enable partial output and resuming.")
+        self.output_entry = ttk.Entry(output_frame, textvariable=self.output_path_var)
+        self.output_entry.grid(row=1, column=0, sticky="ew", padx=(0, 5), pady=(5, 0))
+        self.tooltips.attach(self.output_entry, "The output audio file. Will be created in WAV or MP3 format. For MP3 output, an intermediate WAV file is first created to enable partial output and resuming.")
         
-        self.browse_output_btn = ttk.Button(output_row_frame, text="Browse", command=self.browse_output_file)
-        self.browse_output_btn.pack(side="left")
-        ToolTip(self.browse_output_btn, "Select where to save the output audio file.")
+        self.browse_output_btn = ttk.Button(output_frame, text="Browse", command=self.browse_output_file)
+        self.browse_output_btn.grid(row=1, column=1, pady=(5, 0))
+        self.tooltips.attach(self.browse_output_btn, "Select where to save the output audio file.")
         
     def create_queue_section(self, parent):
         """Create the queue section with table view and control buttons"""
@@ -530,15 +592,15 @@ class TextToSpeechApp:
         
         self.add_to_queue_btn = ttk.Button(queue_control_frame, text="Add to Queue", command=self.add_to_queue, width=12)
         self.add_to_queue_btn.pack(side="top", pady=(0, 5))
-        ToolTip(self.add_to_queue_btn, "Add the current input/output file pair to the conversion queue. Items will be processed sequentially, one at a time.")
+        self.tooltips.attach(self.add_to_queue_btn, "Add the current input/output file pair to the conversion queue. Items are processed one at a time unless Parallel Books is set higher.")
         
         self.clear_queue_btn = ttk.Button(queue_control_frame, text="Clear Queue", command=self.clear_queue, width=12)
         self.clear_queue_btn.pack(side="top", pady=(0, 5))
-        ToolTip(self.clear_queue_btn, "Remove all items from the conversion queue.")
+        self.tooltips.attach(self.clear_queue_btn, "Remove all items from the conversion queue.")
         
         self.delete_selected_btn = ttk.Button(queue_control_frame, text="Delete Selected", command=self.delete_selected_queue_item, width=12)
         self.delete_selected_btn.pack(side="top")
-        ToolTip(self.delete_selected_btn, "Remove the selected item from the conversion queue.")
+        self.tooltips.attach(self.delete_selected_btn, "Remove the selected items from the conversion queue.")
         
         # Pack the treeview, scrollbar, and buttons in the correct order
         self.queue_tree.pack(side="left", fill="both", expand=True)
@@ -558,23 +620,8 @@ class TextToSpeechApp:
         # Use imported voice data
         self.voice_data = VOICE_DATA
         
-        # Create voice list with grades for display
-        voices_with_grades = [
-            f"{voice} ({data['grade']})" for voice, data in self.voice_data.items()
-        ]
-        
         # Language mapping
-        self.language_codes = {
-            "American English": "a",
-            "British English": "b",
-            "Japanese": "j",
-            "Mandarin Chinese": "z",
-            "Spanish": "e",
-            "French": "f",
-            "Hindi": "h",
-            "Italian": "i",
-            "Brazilian Portuguese": "p"
-        }
+        self.language_codes = LANGUAGE_CODES
         
         # Current language (default to American English)
         self.language_var = tk.StringVar(value="American English")
@@ -586,32 +633,29 @@ class TextToSpeechApp:
         ttk.Label(language_frame, text="Language:").pack(anchor="w")
         
         # Language dropdown
-        languages = list(self.language_codes.keys())
-        self.language_dropdown = ttk.Combobox(language_frame, textvariable=self.language_var, values=languages, state="readonly", width=30)
+        self.language_dropdown = ttk.Combobox(language_frame, textvariable=self.language_var, values=tuple(LANGUAGE_CODES), state="readonly", width=30)
         self.language_dropdown.pack(side="left", padx=(0, 5))
         self.language_dropdown.set("American English")  # Set default value
-        ToolTip(self.language_dropdown, "Select the language for the voice. This will filter the available voices.")
+        self.tooltips.attach(self.language_dropdown, "Select the language for the voice. This will filter the available voices.")
         
         # Bind language change event
-        self.language_var.trace_add('write', self._on_language_changed)
+        # Scrolling through the languages only filters the voices and switches pipelines once it settles
+        self.language_var.trace_add('write', lambda *args: self._debounce('language', 100, self._on_language_changed))
         
         # Create a frame for voice dropdown and play sample button
         voice_control_frame = ttk.Frame(voice_frame)
         voice_control_frame.pack(fill="x", pady=(5, 0))
         
         # Voice dropdown with grades
-        voices_with_grades = [
-            f"{voice} ({data['grade']})" for voice, data in self.voice_data.items()
-        ]
-        self.voice_dropdown = ttk.Combobox(voice_control_frame, textvariable=self.voice_var, values=voices_with_grades, state="readonly", width=30)
+        self.voice_dropdown = ttk.Combobox(voice_control_frame, textvariable=self.voice_var, values=VOICES_WITH_GRADES, state="readonly", width=30)
         self.voice_dropdown.pack(side="left", padx=(0, 5))
         self.voice_dropdown.set("af_heart (A)")  # Set default value
-        ToolTip(self.voice_dropdown, "Select a voice for the text-to-speech conversion. Voices are rated by quality (A is best). The Kokoro-82M model generates high-quality speech using neural networks.")
+        self.tooltips.attach(self.voice_dropdown, "Select a voice for the text-to-speech conversion. Voices are rated by quality (A is best). The Kokoro-82M model generates high-quality speech using neural networks.")
         
         # Play Sample button (disabled initially until pipeline loads)
         self.play_sample_btn = ttk.Button(voice_control_frame, text="Play Sample", command=self.play_sample, state="disabled")
         self.play_sample_btn.pack(side="left")
-        ToolTip(self.play_sample_btn, "Play a sample of the selected voice with current settings. Uses the Kokoro pipeline to generate and play a short test phrase.")
+        self.tooltips.attach(self.play_sample_btn, "Play a sample of the selected voice with current settings. Uses the Kokoro pipeline to generate and play a short test phrase.")
         
         # Voice speed slider
         ttk.Label(voice_frame, text="Voice Speed:").pack(anchor="w", pady=(10, 0))
@@ -622,7 +666,7 @@ class TextToSpeechApp:
         self.speed_var = tk.DoubleVar(value=1.0)  # Default speed (1.0 = normal)
         self.speed_slider = ttk.Scale(speed_container, from_=0.5, to=2.0, variable=self.speed_var, orient="horizontal")
         self.speed_slider.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        ToolTip(self.speed_slider, "Adjust the speed of the voice. 1.0 is normal speed, lower is slower, higher is faster. Speed is controlled directly by the Kokoro model for natural prosody.")
+        self.tooltips.attach(self.speed_slider, "Adjust the speed of the voice. 1.0 is normal speed, lower is slower, higher is faster. Speed is controlled directly by the Kokoro model for natural prosody.")
         
         self.speed_value_label = ttk.Label(speed_container, text=f"{self.speed_var.get():.1f}x")
         self.speed_value_label.pack(side="left")
@@ -639,7 +683,7 @@ class TextToSpeechApp:
         self.sample_rate_var = tk.IntVar(value=24000)  # Default sample rate
         self.sample_rate_spinbox = ttk.Spinbox(sample_rate_frame, from_=8000, to=48000, increment=1000, textvariable=self.sample_rate_var, width=10)
         self.sample_rate_spinbox.pack(side="left")
-        ToolTip(self.sample_rate_spinbox, "Set the audio sample rate in Hertz. Higher values provide better quality but larger files. Audio is resampled from Kokoro's native 24kHz using torchaudio.")
+        self.tooltips.attach(self.sample_rate_spinbox, "Set the audio sample rate in Hertz. Higher values provide better quality but larger files. Audio is resampled from Kokoro's native 24kHz using soxr, or torchaudio on the GPU.")
         
         ttk.Label(sample_rate_frame, text="Hz").pack(side="left", padx=(5, 0))
         
@@ -659,7 +703,7 @@ class TextToSpeechApp:
         # Create a scale with 0.02 increments
         self.threshold_slider = ttk.Scale(threshold_container, from_=0, to=0.5, variable=self.threshold_var, orient="horizontal")
         self.threshold_slider.pack(side="left", fill="x", expand=True, padx=(0, 10))
-        ToolTip(self.threshold_slider, "Set the sensitivity for detecting silence. Lower values trim more aggressively. Applied to each audio chunk during generation to reduce awkward pauses. Chunks are calculated by splitting text into sentences and long sentences into sub-chunks.")
+        self.tooltips.attach(self.threshold_slider, "Set the sensitivity for detecting silence. Lower values trim more aggressively. Applied to each audio chunk during generation to reduce awkward pauses. Chunks are calculated by splitting text into sentences and long sentences into sub-chunks.")
         
         self.threshold_value_label = ttk.Label(threshold_container, text=f"{self.threshold_var.get():.2f}")
         self.threshold_value_label.pack(side="left")
@@ -676,7 +720,7 @@ class TextToSpeechApp:
         self.margin_var = tk.IntVar(value=30)  # Default margin value in ms
         self.margin_spinbox = ttk.Spinbox(margin_frame, from_=0, to=500, textvariable=self.margin_var, width=10)
         self.margin_spinbox.pack(side="left")
-        ToolTip(self.margin_spinbox, "Base time in milliseconds to keep before and after detected sound. Converted to samples based on current sample rate and applied during silence trimming of each audio chunk. Multiplied by 2 before the end of a silence, and by 10 after, because human voices trail off more than they trail in.")
+        self.tooltips.attach(self.margin_spinbox, "Base time in milliseconds to keep before and after detected sound. Converted to samples based on current sample rate and applied during silence trimming of each audio chunk. Multiplied by 2 before the end of a silence, and by 10 after, because human voices trail off more than they trail in.")
         
         ttk.Label(margin_frame, text="ms").pack(side="left", padx=(5, 0))
         
@@ -686,19 +730,70 @@ class TextToSpeechApp:
         batch_frame = ttk.Frame(settings_frame)
         batch_frame.pack(fill="x", pady=(5, 0))
         
-        # Get the number of logical CPUs
-        import multiprocessing
-        max_batches = multiprocessing.cpu_count()
+        max_batches = CPU_COUNT
         
         self.batch_count_var = tk.IntVar(value=1)  # Default to 1 batch (no parallelism)
         self.batch_count_spinbox = ttk.Spinbox(batch_frame, from_=1, to=max_batches, textvariable=self.batch_count_var, width=10)
         self.batch_count_spinbox.pack(side="left")
-        ToolTip(self.batch_count_spinbox, "Number of text chunks to process simultaneously. More batches = faster conversion but higher CPU usage. Each batch uses its own Kokoro pipeline instance.")
+        self.tooltips.attach(self.batch_count_spinbox, "Number of text chunks to process simultaneously. More batches = faster conversion but higher CPU usage. All batches share a single copy of the Kokoro model weights.")
         
         ttk.Label(batch_frame, text=f"(1-{max_batches})").pack(side="left", padx=(5, 0))
         
-        # Add trace to handle batch count changes
-        self.batch_count_var.trace_add('write', self._on_batch_count_changed)
+        # Add trace to handle batch count changes, rebuilding the pipelines once clicking through values stops
+        self.batch_count_var.trace_add('write', lambda *args: self._debounce('pipelines', 300, self._on_batch_count_changed))
+        
+        # Number of queued books converted at once
+        ttk.Label(settings_frame, text="Parallel Books:").pack(anchor="w", pady=(10, 0))
+        
+        parallel_books_frame = ttk.Frame(settings_frame)
+        parallel_books_frame.pack(fill="x", pady=(5, 0))
+        
+        self.parallel_books_var = tk.IntVar(value=1)  # Default to converting one book at a time
+        self.parallel_books_spinbox = ttk.Spinbox(parallel_books_frame, from_=1, to=max_batches, textvariable=self.parallel_books_var, width=10)
+        self.parallel_books_spinbox.pack(side="left")
+        self.tooltips.attach(self.parallel_books_spinbox, "Number of queued books to convert at the same time, each in its own process with its own copy of the Kokoro model. Books are spread across all available NVIDIA GPUs. Only used when converting a queue.")
+        
+        ttk.Label(parallel_books_frame, text=f"(1-{max_batches})").pack(side="left", padx=(5, 0))
+        
+        # Number of CPU threads torch uses for inference
+        ttk.Label(settings_frame, text="CPU Threads:").pack(anchor="w", pady=(10, 0))
+        
+        cpu_threads_frame = ttk.Frame(settings_frame)
+        cpu_threads_frame.pack(fill="x", pady=(5, 0))
+        
+        self.cpu_threads_var = tk.IntVar(value=0)  # Default to torch's own choice of one thread per core
+        self.cpu_threads_spinbox = ttk.Spinbox(cpu_threads_frame, from_=0, to=max_batches, textvariable=self.cpu_threads_var, width=10)
+        self.cpu_threads_spinbox.pack(side="left")
+        self.tooltips.attach(self.cpu_threads_spinbox, "Number of CPU threads used for synthesis, resampling and sample playback, or 0 to split one thread per core between the parallel batches. Lower values leave cores free for other programs. Parallel books always split the cores between their processes.")
+        
+        ttk.Label(cpu_threads_frame, text=f"(0-{max_batches}, 0 = all cores)").pack(side="left", padx=(5, 0))
+        
+        # Inference optimizations
+        ttk.Label(settings_frame, text="Inference Optimizations:").pack(anchor="w", pady=(10, 0))
+        
+        # Half precision inference on CUDA
+        self.half_precision_var = tk.BooleanVar(value=False)
+        self.half_precision_checkbox = ttk.Checkbutton(settings_frame, text="Half precision (FP16/BF16)", variable=self.half_precision_var)
+        self.half_precision_checkbox.pack(anchor="w", pady=(5, 0))
+        self.tooltips.attach(self.half_precision_checkbox, "Run the Kokoro model under half precision autocast: FP16 on NVIDIA and Apple Silicon GPUs, BF16 on the CPU. Roughly halves memory bandwidth and speeds up synthesis on tensor-core GPUs and CPUs with BF16 support, with a small possible loss in audio quality. Older CPUs without BF16 support may get slower. Not used together with INT8 quantization on CPU.")
+        
+        # INT8 dynamic quantization for CPU inference
+        self.cpu_int8_var = tk.BooleanVar(value=False)
+        self.cpu_int8_checkbox = ttk.Checkbutton(settings_frame, text="INT8 quantization on CPU", variable=self.cpu_int8_var)
+        self.cpu_int8_checkbox.pack(anchor="w", pady=(5, 0))
+        self.tooltips.attach(self.cpu_int8_checkbox, "Quantize the Kokoro model's linear layers to 8-bit integers when running on the CPU. Makes CPU synthesis faster and the model smaller, with a small possible loss in audio quality. The model is reloaded the next time it is used.")
+        
+        # Reload the model with the new quantization setting on next use
+        self.cpu_int8_var.trace_add('write', self._on_cpu_int8_changed)
+        
+        # torch.compile on CUDA
+        self.compile_model_var = tk.BooleanVar(value=False)
+        self.compile_model_checkbox = ttk.Checkbutton(settings_frame, text="Compile model on CUDA (experimental)", variable=self.compile_model_var)
+        self.compile_model_checkbox.pack(anchor="w", pady=(5, 0))
+        self.tooltips.attach(self.compile_model_checkbox, "Compile the Kokoro model with torch.compile when it is on an NVIDIA GPU, fusing kernels and cutting Python overhead. The first chunks are slow while compiling. Only used with a single parallel batch.")
+        
+        # Recreate pipelines so the compile setting is applied to the loaded model
+        self.compile_model_var.trace_add('write', lambda *args: self._debounce('pipelines', 300, self._on_batch_count_changed))
         
         # MP3 conversion checkbox and bitrate
         ttk.Label(settings_frame, text="MP3 Conversion:").pack(anchor="w", pady=(10, 0))
@@ -709,15 +804,14 @@ class TextToSpeechApp:
         self.convert_to_mp3_var = tk.BooleanVar(value=False)
         self.mp3_checkbox = ttk.Checkbutton(mp3_frame, text="Convert to MP3", variable=self.convert_to_mp3_var)
         self.mp3_checkbox.pack(side="left", padx=(0, 10))
-        ToolTip(self.mp3_checkbox, "Convert the output to MP3 format instead of WAV. An intermediate WAV file is first created to allow partial output and resuming, then converted to MP3 using pydub.")
+        self.tooltips.attach(self.mp3_checkbox, "Convert the output to MP3 format instead of WAV. The MP3 is encoded by ffmpeg as the audio is generated, alongside an intermediate WAV file that allows partial output and resuming.")
         
         ttk.Label(mp3_frame, text="Bitrate:").pack(side="left", padx=(0, 5))
         
         self.mp3_bitrate_var = tk.StringVar(value="192k")
-        mp3_bitrates = ["64k", "96k", "128k", "192k", "256k", "320k"]
-        self.mp3_bitrate_combo = ttk.Combobox(mp3_frame, textvariable=self.mp3_bitrate_var, values=mp3_bitrates, state="readonly", width=8)
+        self.mp3_bitrate_combo = ttk.Combobox(mp3_frame, textvariable=self.mp3_bitrate_var, values=MP3_BITRATES, state="readonly", width=8)
         self.mp3_bitrate_combo.pack(side="left")
-        ToolTip(self.mp3_bitrate_combo, "Select the MP3 bitrate. Higher bitrates provide better quality but larger files. The WAV file is converted to MP3 using pydub's AudioSegment.export method.")
+        self.tooltips.attach(self.mp3_bitrate_combo, "Select the MP3 bitrate. Higher bitrates provide better quality but larger files. \"auto\" uses variable bitrate, which keeps high quality while spending fewer bits on pauses.")
         
         self.mp3_bitrate_combo.set("192k")  # Set default value
         
@@ -733,7 +827,7 @@ class TextToSpeechApp:
         self.max_chunk_length_var = tk.IntVar(value=250)
         self.max_chunk_length_spinbox = ttk.Spinbox(chunk_length_frame, from_=50, to=500, textvariable=self.max_chunk_length_var, width=10)
         self.max_chunk_length_spinbox.pack(side="left")
-        ToolTip(self.max_chunk_length_spinbox, "Maximum number of characters per text chunk. Smaller chunks are more reliable but may create more pauses. Larger chunks are less reliable but flow better. Default is 200 characters.")
+        self.tooltips.attach(self.max_chunk_length_spinbox, "Maximum number of characters per text chunk. Smaller chunks are more reliable but may create more pauses. Larger chunks are less reliable but flow better. Default is 200 characters.")
         
         ttk.Label(chunk_length_frame, text="(50-500)").pack(side="left", padx=(5, 0))
         
@@ -747,18 +841,18 @@ class TextToSpeechApp:
         self.status_var = tk.StringVar(value="Ready to convert")
         self.status_label = ttk.Label(progress_frame, textvariable=self.status_var)
         self.status_label.pack(anchor="w")
-        ToolTip(self.status_label, "Current status of the conversion process. Shows progress through text chunks and batch processing steps.")
+        self.tooltips.attach(self.status_label, "Current status of the conversion process. Shows progress through text chunks and batch processing steps.")
         
         # Timer label
         self.timer_var = tk.StringVar(value="")
         self.timer_label = ttk.Label(progress_frame, textvariable=self.timer_var)
         self.timer_label.pack(anchor="w", pady=(5, 0))
-        ToolTip(self.timer_label, "Time elapsed and estimated time remaining for the current conversion.")
+        self.tooltips.attach(self.timer_label, "Time elapsed and estimated time remaining for the current conversion.")
         
         # Progress bar
         self.progress = ttk.Progressbar(progress_frame, mode='determinate', maximum=1)
         self.progress.pack(fill="x", pady=(10, 0))
-        ToolTip(self.progress, "Progress of the current conversion. Updates after each batch of text chunks is processed. Batches contain multiple chunks processed in parallel.")
+        self.tooltips.attach(self.progress, "Progress of the current conversion. Updates after each batch of text chunks is processed. Batches contain multiple chunks processed in parallel.")
         self.progress.pack_forget()  # Hide initially
         
     def create_control_buttons_section(self, parent):
@@ -774,12 +868,12 @@ class TextToSpeechApp:
         # Convert button (disabled initially until pipeline loads)
         self.convert_btn = ttk.Button(button_container, text="Convert to Speech", command=self.convert_to_speech, state="disabled")
         self.convert_btn.pack(side="left", padx=(0, 5))
-        ToolTip(self.convert_btn, "Start converting the text to speech with current settings.")
+        self.tooltips.attach(self.convert_btn, "Start converting the text to speech with current settings.")
         
         # Stop button (initially disabled)
         self.stop_btn = ttk.Button(button_container, text="Stop", command=self.stop_conversion, state="disabled")
         self.stop_btn.pack(side="left")
-        ToolTip(self.stop_btn, "Stop the current conversion process.")
+        self.tooltips.attach(self.stop_btn, "Stop the current conversion process.")
         
     def create_console_output_section(self, parent):
         """Create the console output section with text area and scrollbar"""
@@ -795,7 +889,7 @@ class TextToSpeechApp:
         self.console_text.configure(yscrollcommand=console_scrollbar.set)
         
         self.console_text.pack(side="left", fill="both", expand=True)
-        ToolTip(self.console_text, "Detailed output and logs from the conversion process. Shows pipeline initialization, chunk processing progress, timing estimates, and any errors or warnings.")
+        self.tooltips.attach(self.console_text, "Detailed output and logs from the conversion process. Shows pipeline initialization, chunk processing progress, timing estimates, and any errors or warnings.")
         
         console_scrollbar.pack(side="right", fill="y")
         
@@ -839,66 +933,20 @@ class TextToSpeechApp:
     
     def convert_to_text_with_pandoc(self, file_path):
         """Convert EPUB, HTML, PDF, or DocX files to plain text using pandoc"""
-        try:
-            # Check if pandoc is available
-            if not self.is_pandoc_available():
-                raise Exception("Pandoc is not installed or not available in PATH")
-            
-            # Determine the format based on file extension
-            ext = os.path.splitext(file_path)[1].lower()
-            if ext == '.epub':
-                format_arg = 'epub'
-            elif ext == '.html' or ext == '.htm':
-                format_arg = 'html'
-            elif ext == '.pdf':
-                format_arg = 'pdf'
-            elif ext == '.docx':
-                format_arg = 'docx'
-            elif ext == '.rtf':
-                format_arg = 'rtf'
-            elif ext == '.md':
-                format_arg = 'gfm'
-            else:
-                # For plain text files, no conversion needed
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    return file.read()
-            
-            # Run pandoc to convert to plain text
-            result = subprocess.run([
-                'pandoc',
-                '--from', format_arg,
-                '--to', 'plain',
-                '--wrap', 'none',  # Prevent line wrapping
-                file_path
-            ], capture_output=True, text=True, check=True)
-            
-            return result.stdout
-        except subprocess.CalledProcessError as e:
-            raise Exception(f"Pandoc conversion failed: {e.stderr}")
-        except FileNotFoundError:
-            raise Exception("Pandoc is not installed or not available in PATH")
-        except Exception as e:
-            raise Exception(f"Error converting file: {str(e)}")
+        from text_processor import convert_to_text_with_pandoc
+        return convert_to_text_with_pandoc(file_path)
 
     def load_file_content(self, file_path):
         """Load the content of a text file into the editor"""
+        from text_processor import load_text_file
         try:
-            # Get file extension
-            ext = os.path.splitext(file_path)[1].lower()
-            
-            # Convert file to text if it's not already plain text
-            if ext in ['.epub', '.html', '.htm', '.pdf', '.docx']:
-                content = self.convert_to_text_with_pandoc(file_path)
-            else:
-                # For plain text files, read directly
-                with open(file_path, 'r', encoding='utf-8') as file:
-                    content = file.read()
-            
-            # Clean unwanted unicode characters while preserving multilingual text
-            content = clean_unicode_text(content)
+            # Convert to plain text if needed and clean unwanted unicode characters
+            content = load_text_file(file_path)
             
             self.editor_text.delete(1.0, tk.END)
-            self.editor_text.insert(1.0, content)
+            # Insert a large book a slice at a time, so Tcl never has to build a converted copy of the whole text at once
+            for offset in range(0, len(content), EDITOR_INSERT_CHUNK):
+                self.editor_text.insert(tk.END, content[offset:offset + EDITOR_INSERT_CHUNK])
             self.editor_status_var.set(f"Loaded: {os.path.basename(file_path)}")
             self.text_editor_modified = False
             self.editor_text.edit_modified(False)
@@ -950,6 +998,7 @@ class TextToSpeechApp:
 
     def toggle_newline_replacement(self):
         """Toggle replacement of single newlines with spaces"""
+        from text_processor import apply_text_transformations
         if self.replace_newlines_var.get():
             # Store original content before replacement
             self.original_text_content = self.editor_text.get(1.0, tk.END + "-1c")
@@ -977,6 +1026,7 @@ class TextToSpeechApp:
 
     def toggle_merge_paragraphs(self):
         """Toggle merging of accidentally split paragraphs"""
+        from text_processor import apply_text_transformations
         if self.merge_paragraphs_var.get():
             # Store original content before replacement
             if not self.replace_newlines_var.get():  # Only store if not already stored
@@ -1004,16 +1054,12 @@ class TextToSpeechApp:
         self.convert_math_checkbox.config(text="Convert math formulas and tables to verbal descriptions using AI")
 
     def on_text_editor_change(self, event=None):
-        """Handle changes in the text editor"""
+        """Handle changes in the text editor's modified flag"""
         # Schedule update to avoid too many calls
         if hasattr(self, '_update_editor_status_job'):
             self.root.after_cancel(self._update_editor_status_job)
         self._update_editor_status_job = self.root.after(100, self.update_editor_status)
         
-        # Clear cached math conversion when text is manually modified
-        self.converted_text_content = ""
-        self.convert_math_checkbox.config(text="Convert math formulas and tables to verbal descriptions using AI")
-        
     def update_editor_status(self):
         """Update the editor status label"""
         if not self.editor_collapsed:
@@ -1090,8 +1136,8 @@ class TextToSpeechApp:
     def toggle_math_conversion(self):
         """Toggle math and table conversion on/off"""
         if self.convert_math_var.get():
-            # If we have cached converted text, use it, because if the original text has been modified, the cache gets cleared elsewhere.
-            if self.converted_text_content:
+            # If we have cached converted text for exactly the current text, use it; any edit since makes the texts differ
+            if self.converted_text_content and self.editor_text.get(1.0, tk.END + "-1c") == self.converted_source_content:
                 self.editor_text.delete(1.0, tk.END)
                 self.editor_text.insert(1.0, self.converted_text_content)
                 # Mark as modified
@@ -1109,7 +1155,7 @@ class TextToSpeechApp:
                 
             # Show processing status
             self.status_var.set("Converting math formulas and tables to verbal descriptions...")
-            self.root.update()
+            self.root.update_idletasks()
             
             # Run conversion in a separate thread
             import threading
@@ -1141,6 +1187,7 @@ class TextToSpeechApp:
             
             # Cache the converted text
             self.converted_text_content = processed_content
+            self.converted_source_content = text_content
             # Update checkbox text to indicate cached conversion
             self.convert_math_checkbox.config(text="Convert math formulas and tables to verbal descriptions using AI (cached)")
             
@@ -1193,45 +1240,57 @@ class TextToSpeechApp:
         os.makedirs(self.config_dir, exist_ok=True)
         
         config_file = os.path.join(self.config_dir, "settings.json")
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r') as f:
-                    settings = json.load(f)
-                    
-                # Load recent files
-                self.recent_files = settings.get("recent_files", [])
-                self.update_recent_files_menu()
-                
-                # Load last used settings
-                last_settings = settings.get("last_settings", {})
-                
-                # Only set the variables if they exist (after widget creation)
-                if hasattr(self, 'voice_var') and self.voice_var:
-                    self.voice_var.set(last_settings.get("voice", "af_heart (A)"))
-                if hasattr(self, 'speed_var') and self.speed_var:
-                    self.speed_var.set(last_settings.get("speed", 1.0))
-                if hasattr(self, 'sample_rate_var') and self.sample_rate_var:
-                    self.sample_rate_var.set(last_settings.get("sample_rate", 24000))
-                if hasattr(self, 'convert_to_mp3_var') and self.convert_to_mp3_var:
-                    self.convert_to_mp3_var.set(last_settings.get("convert_to_mp3", False))
-                if hasattr(self, 'mp3_bitrate_var') and self.mp3_bitrate_var:
-                    self.mp3_bitrate_var.set(last_settings.get("mp3_bitrate", "192k"))
-                if hasattr(self, 'threshold_var') and self.threshold_var:
-                    self.threshold_var.set(last_settings.get("threshold", 0.06))
-                if hasattr(self, 'margin_var') and self.margin_var:
-                    self.margin_var.set(last_settings.get("margin", 30))
-                if hasattr(self, 'batch_count_var') and self.batch_count_var:
-                    self.batch_count_var.set(last_settings.get("batch_count", 1))
-                if hasattr(self, 'language_var') and self.language_var:
-                    self.language_var.set(last_settings.get("language", "American English"))
-                if hasattr(self, 'max_chunk_length_var') and self.max_chunk_length_var:
-                    self.max_chunk_length_var.set(last_settings.get("max_chunk_length", 200))
-                
-                # Update UI elements that depend on these settings
-                # This will be done after widget creation
+        try:
+            with open(config_file, 'r') as f:
+                settings = json.load(f)
                 
-            except Exception as e:
-                print(f"Error loading settings: {e}")
+            # Load recent files
+            self.recent_files = settings.get("recent_files", [])
+            self.update_recent_files_menu()
+            
+            # Load last used settings
+            last_settings = settings.get("last_settings", {})
+            
+            # Only set the variables if they exist (after widget creation)
+            if hasattr(self, 'voice_var') and self.voice_var:
+                self.voice_var.set(last_settings.get("voice", "af_heart (A)"))
+            if hasattr(self, 'speed_var') and self.speed_var:
+                self.speed_var.set(last_settings.get("speed", 1.0))
+            if hasattr(self, 'sample_rate_var') and self.sample_rate_var:
+                self.sample_rate_var.set(last_settings.get("sample_rate", 24000))
+            if hasattr(self, 'convert_to_mp3_var') and self.convert_to_mp3_var:
+                self.convert_to_mp3_var.set(last_settings.get("convert_to_mp3", False))
+            if hasattr(self, 'mp3_bitrate_var') and self.mp3_bitrate_var:
+                self.mp3_bitrate_var.set(last_settings.get("mp3_bitrate", "192k"))
+            if hasattr(self, 'threshold_var') and self.threshold_var:
+                self.threshold_var.set(last_settings.get("threshold", 0.06))
+            if hasattr(self, 'margin_var') and self.margin_var:
+                self.margin_var.set(last_settings.get("margin", 30))
+            if hasattr(self, 'batch_count_var') and self.batch_count_var:
+                self.batch_count_var.set(last_settings.get("batch_count", 1))
+            if hasattr(self, 'parallel_books_var') and self.parallel_books_var:
+                self.parallel_books_var.set(last_settings.get("parallel_books", 1))
+            if hasattr(self, 'cpu_threads_var') and self.cpu_threads_var:
+                self.cpu_threads_var.set(last_settings.get("cpu_threads", 0))
+            if hasattr(self, 'half_precision_var') and self.half_precision_var:
+                self.half_precision_var.set(last_settings.get("half_precision", False))
+            if hasattr(self, 'cpu_int8_var') and self.cpu_int8_var:
+                self.cpu_int8_var.set(last_settings.get("cpu_int8", False))
+            if hasattr(self, 'compile_model_var') and self.compile_model_var:
+                self.compile_model_var.set(last_settings.get("compile_model", False))
+            if hasattr(self, 'language_var') and self.language_var:
+                self.language_var.set(last_settings.get("language", "American English"))
+            if hasattr(self, 'max_chunk_length_var') and self.max_chunk_length_var:
+                self.max_chunk_length_var.set(last_settings.get("max_chunk_length", 200))
+            
+            # Update UI elements that depend on these settings
+            # This will be done after widget creation
+            
+        except FileNotFoundError:
+            # No settings saved yet
+            pass
+        except Exception as e:
+            print(f"Error loading settings: {e}")
 
     def save_settings(self):
         """Save recent files and settings to config file"""
@@ -1250,6 +1309,11 @@ class TextToSpeechApp:
                 "threshold": self.threshold_var.get(),
                 "margin": self.margin_var.get(),
                 "batch_count": self.batch_count_var.get(),
+                "parallel_books": self.parallel_books_var.get(),
+                "cpu_threads": self.cpu_threads_var.get(),
+                "half_precision": self.half_precision_var.get(),
+                "cpu_int8": self.cpu_int8_var.get(),
+                "compile_model": self.compile_model_var.get(),
                 "language": self.language_var.get(),
                 "max_chunk_length": self.max_chunk_length_var.get()
             }
@@ -1258,13 +1322,23 @@ class TextToSpeechApp:
         config_file = os.path.join(self.config_dir, "settings.json")
         print(f"Saving settings to {config_file}")
         try:
-            with open(config_file, 'w') as f:
-                json.dump(settings, f, indent=2)
+            # Write a temporary file and swap it in, so being killed mid-save never leaves truncated settings
+            temp_file = config_file + ".tmp"
+            with open(temp_file, 'w') as f:
+                # Serialize in one go and hand the file a single write, rather than the many small
+                # writes json.dump makes while walking the settings
+                f.write(json.dumps(settings, indent=2))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_file, config_file)
         except Exception as e:
             print(f"Error saving settings: {e}")
 
     def update_recent_files(self, file_path):
         """Add file to recent files list (limit to 10 files)"""
+        # Reopening the most recent file changes nothing, so don't rebuild the menu item by item
+        if self.recent_files and self.recent_files[0] == file_path:
+            return
         if file_path in self.recent_files:
             self.recent_files.remove(file_path)
         self.recent_files.insert(0, file_path)
@@ -1355,11 +1429,11 @@ class TextToSpeechApp:
         self.queue_items.append(queue_item)
         
         # Add to treeview
-        self.queue_tree.insert("", "end", values=(
+        self.queue_item_ids.append(self.queue_tree.insert("", "end", values=(
             os.path.basename(input_path),
             os.path.basename(output_path),
             '⏳ Pending'
-        ))
+        )))
         
         # Clear input and output fields
         self.input_path_var.set("")
@@ -1380,7 +1454,8 @@ class TextToSpeechApp:
         
         if result:
             self.queue_items.clear()
-            self.queue_tree.delete(*self.queue_tree.get_children())
+            self.queue_tree.delete(*self.queue_item_ids)
+            self.queue_item_ids.clear()
             print("Queue cleared")
 
     def delete_selected_queue_item(self):
@@ -1390,39 +1465,43 @@ class TextToSpeechApp:
             messagebox.showwarning("Warning", "Please select an item to delete.")
             return
             
-        # Get the index of the selected item
-        item_index = self.queue_tree.index(selected_item[0])
+        # Get the indices of all selected items, last first so deleting one doesn't shift the others
+        item_indices = sorted((self.queue_tree.index(item) for item in selected_item), reverse=True)
         
         # Remove from queue items list
-        del self.queue_items[item_index]
+        for item_index in item_indices:
+            del self.queue_items[item_index]
+            del self.queue_item_ids[item_index]
         
-        # Remove from treeview
-        self.queue_tree.delete(selected_item[0])
+        # Remove from treeview in a single call
+        self.queue_tree.delete(*selected_item)
         
-        print(f"Deleted queue item at index {item_index}")
+        print(f"Deleted queue items at indices {sorted(item_indices)}")
 
     def _pull_resume_info(self):
         lockfile_path = self.input_path_var.get() + ".lock"
-        # Load existing lockfile if it exists
+        # Load existing lockfile if it exists, opening it directly rather than checking for it first
         resume_info = {}
-        if os.path.exists(lockfile_path):
-            try:
-                with open(lockfile_path, 'r') as lf:
-                    resume_info = json.load(lf)
-                    # Set voice with grade if available
-                    voice = resume_info['voice']
-                    if voice in self.voice_data:
-                        grade = self.voice_data[voice]['grade']
-                        self.voice_var.set(f"{voice} ({grade})")
-                    else:
-                        self.voice_var.set(voice)
-                    self.speed_var.set(resume_info.get('speed', 1.0))
-                    self.sample_rate_var.set(resume_info.get('sample_rate', 24000))
-                    self.convert_to_mp3_var.set(resume_info.get('convert_to_mp3', False))
-                    self.mp3_bitrate_var.set(resume_info.get('mp3_bitrate', '192k'))
-                    self.start_chunk_idx = resume_info.get('failed_chunk_index', 0) or 0
-            except (json.JSONDecodeError, FileNotFoundError) as e:
-                print(f"Warning: Error loading lockfile: {e}. Starting from beginning.")
+        try:
+            with open(lockfile_path, 'r') as lf:
+                resume_info = json.load(lf)
+                # Set voice with grade if available
+                voice = resume_info['voice']
+                if voice in self.voice_data:
+                    grade = self.voice_data[voice].grade
+                    self.voice_var.set(f"{voice} ({grade})")
+                else:
+                    self.voice_var.set(voice)
+                self.speed_var.set(resume_info.get('speed', 1.0))
+                self.sample_rate_var.set(resume_info.get('sample_rate', 24000))
+                self.convert_to_mp3_var.set(resume_info.get('convert_to_mp3', False))
+                self.mp3_bitrate_var.set(resume_info.get('mp3_bitrate', '192k'))
+                self.start_chunk_idx = resume_info.get('failed_chunk_index', 0) or 0
+        except FileNotFoundError:
+            # Nothing to resume
+            pass
+        except json.JSONDecodeError as e:
+            print(f"Warning: Error loading lockfile: {e}. Starting from beginning.")
 
         # Open SoundFile in append mode if resuming, otherwise write mode
         if self.start_chunk_idx > 0 and os.path.exists(self.output_path_var.get()):
@@ -1439,7 +1518,7 @@ class TextToSpeechApp:
             voice = voice_with_grade.split(" (")[0]  # Extract voice identifier before the grade
             self.status_var.set(f"Resuming from chunk {self.start_chunk_idx + 1} with voice {voice}, speed {self.speed_var.get()}x, sample rate {self.sample_rate_var.get()}Hz{mp3_info}...")
             
-        self.root.update()
+        self.root.update_idletasks()
 
     def _setup_signal_handlers(self):
         """Set up signal handlers for graceful shutdown"""
@@ -1478,8 +1557,8 @@ class TextToSpeechApp:
                     'mp3_bitrate': self.mp3_bitrate_var.get(),
                     'timestamp': time.time()
                 }
-                with open(lockfile_path, 'w') as lf:
-                    json.dump(failure_info, lf, indent=2)
+                from convert_worker import write_lockfile
+                write_lockfile(lockfile_path, failure_info)
                 print(f"Lockfile created at {lockfile_path}")
             except Exception as e:
                 print(f"Error creating lockfile: {e}")
@@ -1495,12 +1574,12 @@ class TextToSpeechApp:
             try:
                 print("Initializing pipeline system...")
                 self.status_var.set("Initializing pipeline system...")
-                self.root.update()
+                self.root.update_idletasks()
                 
                 # Show progress bar for pipeline loading
                 self.progress.pack(fill="x", pady=(10, 0))
                 self.progress.configure(mode='determinate', maximum=100, value=0)
-                self.root.update()  # Force UI update
+                self.root.update_idletasks()  # Force UI update
                 
                 # We no longer create pipelines in the main app
                 # Pipelines are now created in the workers
@@ -1509,11 +1588,13 @@ class TextToSpeechApp:
                 # Initialize or update workers with the pipelines
                 def update_progress(progress_msg=None, timer_msg=None, progress_value=None):
                     """Unified progress update function for both pipeline loading and conversion"""
-                    self.root.after(0, lambda: (
-                        self.status_var.set(progress_msg) if progress_msg is not None else None,
-                        self.timer_var.set(timer_msg) if timer_msg is not None else None,
-                        self.progress.configure(value=progress_value * 100) if progress_value is not None else None
-                    ))
+                    # Short chunks can report progress many times a second, so only refresh the
+                    # display a few times a second, but always show the final update
+                    now = time.monotonic_ns()
+                    if now - self.last_progress_ns < PROGRESS_UPDATE_INTERVAL_NS and progress_value != 1:
+                        return
+                    self.last_progress_ns = now
+                    self.root.after(0, self._show_progress, progress_msg, timer_msg, progress_value)
                 
                 convert_ui_callbacks = {
                     'start_conversion': lambda: self.root.after(0, self._start_conversion_ui),
@@ -1536,6 +1617,28 @@ class TextToSpeechApp:
                     self.convert_worker = ConvertWorker(self, ui_callbacks=convert_ui_callbacks)
                     self.queue_worker = QueueWorker(self, ui_callbacks=queue_ui_callbacks | convert_ui_callbacks)
                     
+                    # Load the model and run one tiny synthesis now, so the first conversion or sample
+                    # doesn't also pay for lazy initialization and GPU kernel autotuning
+                    self.status_var.set("Warming up Kokoro model...")
+                    try:
+                        self.convert_worker.prewarm(self.voice_var.get().split(" (")[0])
+                    except Exception as e:
+                        print(f"Model warm-up failed, it will be loaded on first use instead: {e}")
+                        self.convert_worker.unload_pipelines()
+                    
+                    # Import what sample playback and resampling use now, so the first Play Sample
+                    # click doesn't stall on an import. torchaudio takes seconds to import and holds the
+                    # GIL while it does, so it is only loaded where it's used: resampling on an accelerator.
+                    preload_modules = ['soxr', 'sounddevice']
+                    pipelines = self.convert_worker.pipelines
+                    if pipelines and pipelines[0].model.device.type != 'cpu':
+                        preload_modules.insert(0, 'torchaudio')
+                    for module_name in preload_modules:
+                        try:
+                            importlib.import_module(module_name)
+                        except Exception as e:
+                            print(f"Could not preload {module_name}: {e}")
+                    
                     self.status_var.set("Pipeline system initialized. Ready to convert.")
                     # Hide progress bar when done loading
                     self.progress.pack_forget()
@@ -1575,8 +1678,7 @@ class TextToSpeechApp:
             self.current_queue_index = 0
             
             if self.queue_worker is not None:
-                self.convert_worker_thread = threading.Thread(target=self.queue_worker.process_queue, daemon=True)
-                self.convert_worker_thread.start()
+                self._start_worker_thread(self.queue_worker.process_queue)
         else:
             # Process single file (original behavior)
             output_path = self.output_path_var.get()
@@ -1585,6 +1687,7 @@ class TextToSpeechApp:
             text_content = self.editor_text.get(1.0, tk.END)
             
             # Apply text transformations (without math conversion)
+            from text_processor import apply_text_transformations
             text_content = apply_text_transformations(
                 text_content,
                 self.replace_newlines_var.get() if hasattr(self, 'replace_newlines_var') and self.replace_newlines_var.get() else None,
@@ -1603,50 +1706,71 @@ class TextToSpeechApp:
             
             if self.convert_worker is not None:
                 # Start conversion in background thread
-                self.convert_worker_thread = threading.Thread(
-                    target=self.convert_worker.convert_file, 
-                    args=(text_content, output_path), 
-                    daemon=True
-                )
-                self.convert_worker_thread.start()
+                self._start_worker_thread(self.convert_worker.convert_file, text_content, output_path)
+        
+    def _confirm_nonmodal(self, title, message, on_confirm):
+        """
+        Ask a yes/no question without a modal dialog, calling on_confirm if the user answers yes
+        
+        messagebox.askyesno runs a nested event loop until it is answered, which holds up the main
+        loop while a conversion keeps printing and reporting progress; this window doesn't.
+        """
+        # Only one question at a time
+        if self.confirm_window is not None and self.confirm_window.winfo_exists():
+            self.confirm_window.lift()
+            return
+        
+        self.confirm_window = window = tk.Toplevel(self.root)
+        window.title(title)
+        window.transient(self.root)
+        window.resizable(False, False)
+        
+        ttk.Label(window, text=message, justify=tk.LEFT, padding=15).pack()
+        button_frame = ttk.Frame(window, padding=(15, 0, 15, 15))
+        button_frame.pack(fill=tk.X)
+        
+        def answer(confirmed):
+            window.destroy()
+            self.confirm_window = None
+            if confirmed:
+                on_confirm()
+        
+        ttk.Button(button_frame, text="No", command=lambda: answer(False)).pack(side=tk.RIGHT)
+        ttk.Button(button_frame, text="Yes", command=lambda: answer(True)).pack(side=tk.RIGHT, padx=(0, 5))
+        window.protocol("WM_DELETE_WINDOW", lambda: answer(False))
+        window.bind("<Escape>", lambda event: answer(False))
         
     def abort_conversion_process(self):
         """Abort the current conversion process"""
         print("Pausing conversion process...")
-        result = messagebox.askyesno(
+        # We want to create a lockfile when aborting
+        self._confirm_nonmodal(
             "Pause Conversion",
             "Are you sure you want to pause the conversion?\n\n"
             "A lockfile will be created, so you can always resume later.",
-            icon="warning"
+            self._abort_conversion_ui
         )
-        if result:
-            # We want to create a lockfile when aborting
-            self.root.after(0, self._abort_conversion_ui)
                                     
     def stop_conversion(self):
         """Stop the current conversion process without creating a lockfile"""
         print("Stopping conversion process...")
-        result = messagebox.askyesno(
+        
+        def confirmed():
+            # Don't create lockfile when stopping - set to STOP right away so the worker starts winding down
+            self.app_state.set_state(AppState.STOP)
+            # We'll handle the cleanup in the worker thread
+            self.root.after(0, self._stop_conversion_ui)
+        
+        self._confirm_nonmodal(
             "Stop Conversion",
             "Are you sure you want to stop the conversion?\n\n"
             "The incomplete audio file will be saved, but no lockfile will be created.",
-            icon="warning"
+            confirmed
         )
-        if result:
-            # Don't create lockfile when stopping - set to STOP
-            self.app_state.set_state(AppState.STOP)
-            if len(self.queue_items) > 0:
-                del self.queue_items[self.current_queue_index]
-                self.queue_tree.delete(self.queue_tree.get_children()[self.current_queue_index])
-                self.current_queue_index = 0
-            else:
-                print("Queue is already empty.")
-            # We'll handle the cleanup in the worker thread
-            self.root.after(0, self._stop_conversion_ui)
         
     def play_sample(self):
         """Play a sample of text with the selected voice"""
-        if not self.pipeline_loaded and (not self.convert_worker or not hasattr(self.convert_worker, 'pipelines') or not self.convert_worker.pipelines):
+        if not self.pipeline_loaded or not self.convert_worker:
             messagebox.showwarning("Warning", "Pipeline is still loading. Please wait.")
             return
         
@@ -1665,54 +1789,70 @@ class TextToSpeechApp:
         # Generate audio in a separate thread to avoid blocking UI
         def generate_and_play():
             try:
-                # Generate audio using the worker's pipeline
-                if self.convert_worker and hasattr(self.convert_worker, 'pipelines') and self.convert_worker.pipelines:
-                    # Use the worker's pipeline
-                    pipeline = self.convert_worker.pipelines[0]
+                # Generate audio using the worker's pipeline, loading it on first use
+                if self.convert_worker:
+                    pipeline = self.convert_worker.ensure_pipelines()[0]
                 else:
                     raise ValueError("No pipeline available")
                     
                 audio_generator = pipeline(
                     sample_text,
-                    voice=voice,
+                    voice=self.convert_worker.get_voice_pack(voice),  # Shared with conversions instead of loaded per press
                     speed=speed
                 )
                 
-                # Collect all audio chunks
-                audio_chunks = []
-                for i, (code, phonemes, audio) in enumerate(audio_generator):
-                    if audio is not None:
-                        audio_chunks.append(audio)
-                
-                if not audio_chunks:
-                    raise ValueError("No audio generated")
-                
-                # Concatenate all audio chunks
-                full_audio = np.concatenate(audio_chunks)
+                import torch
+                import numpy as np
+                from tts_generator import resample_audio, float_to_pcm16
                 
-                # Resample if needed
-                if sample_rate != 24000:  # Kokoro default is 24000 Hz
-                    import torchaudio
-                    import torch
-                    # Convert numpy array to tensor
-                    audio_tensor = torch.from_numpy(full_audio.T)
-                    resampled_audio = torchaudio.functional.resample(audio_tensor, 24000, sample_rate)
-                    full_audio = resampled_audio.T.numpy()
+                def sample_chunks():
+                    """Yield each synthesized chunk as float32 audio of shape (time, 1) at the chosen sample rate"""
+                    for code, phonemes, audio in audio_generator:
+                        if audio is None:
+                            continue
+                        
+                        # Resample if needed
+                        if sample_rate != 24000:  # Kokoro default is 24000 Hz
+                            audio = resample_audio(audio, sample_rate, pipeline.model.device)
+                        yield np.ascontiguousarray(audio.cpu().numpy(), dtype=np.float32).reshape(-1, 1)
                 
-                # Create a temporary file
-                with tempfile.NamedTemporaryFile(suffix='.wav', delete=False) as temp_file:
-                    temp_path = temp_file.name
-                    
-                # Save audio to temporary file
-                sf.write(temp_path, full_audio, sample_rate)
+                try:
+                    import sounddevice as sd
+                except (ImportError, OSError) as e:
+                    # sounddevice raises OSError when the PortAudio library itself is missing
+                    print(f"sounddevice unavailable ({e}), playing the sample with simpleaudio instead")
+                    sd = None
                 
-                # Play the audio file
-                wave_obj = sa.WaveObject.from_wave_file(temp_path)
-                play_obj = wave_obj.play()
-                play_obj.wait_done()
+                played_audio = False
+                # Skip autograd bookkeeping to shorten the stretches this thread holds the GIL
+                # between torch ops (which release it), keeping the Tk thread responsive
+                with torch.inference_mode():
+                    if sd is not None:
+                        # Stream each chunk to the soundcard as soon as it is synthesized, so playback
+                        # starts after the first chunk instead of after the whole sample
+                        with sd.OutputStream(samplerate=sample_rate, channels=1, dtype='float32') as stream:
+                            for audio in sample_chunks():
+                                # Blocks only this background thread while PortAudio's buffer is full
+                                stream.write(audio)
+                                played_audio = True
+                            # Leaving the block stops the stream, which waits for the queued audio to finish playing
+                    else:
+                        # simpleaudio can't stream, so play the whole sample from memory once it is synthesized
+                        import simpleaudio as sa
+                        chunks = list(sample_chunks())
+                        if chunks:
+                            # Quantize each chunk straight into one int16 buffer instead of first
+                            # concatenating the float chunks into a second copy of the whole sample
+                            pcm = np.empty((sum(len(chunk) for chunk in chunks), 1), dtype='<i2')
+                            offset = 0
+                            for chunk in chunks:
+                                float_to_pcm16(chunk, out=pcm[offset:offset + len(chunk)])
+                                offset += len(chunk)
+                            sa.play_buffer(pcm, 1, 2, sample_rate).wait_done()
+                            played_audio = True
                 
-                # Clean up temporary file
-                os.unlink(temp_path)
+                if not played_audio:
+                    raise ValueError("No audio generated")
                 
                 # Update status
                 self.root.after(0, lambda: self.status_var.set("Sample playback complete."))
@@ -1727,16 +1867,20 @@ class TextToSpeechApp:
         
     
 
+    def _show_progress(self, progress_msg, timer_msg, progress_value):
+        """Show a progress update from a worker (runs on the Tk main thread)"""
+        if progress_msg is not None:
+            self.status_var.set(progress_msg)
+        if timer_msg is not None:
+            self.timer_var.set(timer_msg)
+        if progress_value is not None:
+            self.progress.configure(value=progress_value * 100)
+
     def _update_queue_item_status(self, index, status):
         """Update the status of a queue item in the treeview"""
-        # Get all items in the treeview
-        children = self.queue_tree.get_children()
-        if index < len(children):
-            # Get the current values
-            current_values = self.queue_tree.item(children[index])['values']
-            # Update the status (third column)
-            new_values = (current_values[0], current_values[1], status)
-            self.queue_tree.item(children[index], values=new_values)
+        if index < len(self.queue_item_ids):
+            # Update just the status cell instead of reading and rewriting the whole row
+            self.queue_tree.set(self.queue_item_ids[index], "status", status)
 
     def _finish_queue_processing_ui(self):
         """Update UI when queue processing finishes"""
@@ -1747,8 +1891,8 @@ class TextToSpeechApp:
         # Calculate total time
         if self.start_time is not None:
             total_time = time.time() - self.start_time
-            total_mins, total_secs = divmod(int(total_time), 60)
-            total_time_str = f"Total time: {total_mins:02d}:{total_secs:02d}"
+            from tts_generator import format_duration
+            total_time_str = f"Total time: {format_duration(int(total_time))}"
         else:
             total_time_str = ""
             
@@ -1757,51 +1901,73 @@ class TextToSpeechApp:
         self.timer_var.set(total_time_str)
         messagebox.showinfo("Success", "Queue processing completed!")
 
+    def _start_worker_thread(self, target, *args):
+        """Run target in the background worker thread, setting _worker_done when it returns or raises"""
+        def run():
+            try:
+                target(*args)
+            finally:
+                self._worker_done.set()
+        
+        self._worker_done.clear()
+        self.convert_worker_thread = threading.Thread(target=run, daemon=True)
+        self.convert_worker_thread.start()
+
     def _wait_for_worker(self):
-        """Wait for worker thread to finish only if it should stop"""
-        while (self.convert_worker_thread is not None and 
-               self.convert_worker_thread.is_alive() and 
-               self.app_state.is_aborted):
+        """Reset the UI and app state once the worker thread has stopped, without blocking the main loop"""
+        if not self._worker_done.is_set():
             print("Waiting for worker thread to exit safely...")
-            time.sleep(0.1)
         
-        # Reset app state to IDLE after worker has finished or when not aborted
-        if self.app_state.is_aborted:
-            print("Worker finished, resetting app state to IDLE")
-            self.app_state.set_state(AppState.IDLE)
+        def check():
+            # Poll instead of waiting on the event: this runs inside set_state, and the worker still
+            # makes Tk calls on its way out that need the main loop running
+            if not self._worker_done.is_set() and self.app_state.is_aborted:
+                self.root.after(50, check)
+                return
+            # Reset app state to IDLE after worker has finished, unless it already moved on
+            if self.app_state.is_aborted:
+                self._update_ui_state()
+                print("Worker finished, resetting app state to IDLE")
+                self.app_state.set_state(AppState.IDLE)
+        
+        self.root.after(50, check)
                         
     def _update_ui_state(self, output_path=None, error_msg=None):
         """Unified UI state management function that dispatches based on app state"""
         current_state = self.app_state.state
         
-        # Set basic UI elements state based on current app state
+        # Set basic UI elements state based on current app state, but only when it actually changes,
+        # since every config call is a Tk round trip and may trigger a geometry recalculation
         self.progress.configure(value=0)
-        if not self.app_state.is_active:
-            self.progress.pack_forget()
-            self.input_entry.config(state="readonly")  # Keep input read-only
-            self.browse_input_btn.config(state="normal")
-            self.output_entry.config(state="normal")
-            self.browse_output_btn.config(state="normal")
-            self.voice_dropdown.config(state="normal")
-            self.convert_btn.config(state="normal", text="Convert to Speech", command=self.convert_to_speech)
-            self.stop_btn.config(state="disabled")
-            # Enable queue controls
-            self.add_to_queue_btn.config(state="normal")
-            self.clear_queue_btn.config(state="normal")
-            self.delete_selected_btn.config(state="normal")
-        else:
-            self.progress.pack(fill="x", pady=(10, 0))
-            self.input_entry.config(state="disabled")
-            self.browse_input_btn.config(state="disabled")
-            self.output_entry.config(state="disabled")
-            self.browse_output_btn.config(state="disabled")
-            self.voice_dropdown.config(state="disabled")
-            self.convert_btn.config(state="normal", text="Pause", command=self.abort_conversion_process)
-            self.stop_btn.config(state="normal")
-            # Disable queue controls during processing
-            self.add_to_queue_btn.config(state="disabled")
-            self.clear_queue_btn.config(state="disabled")
-            self.delete_selected_btn.config(state="disabled")
+        is_active = self.app_state.is_active
+        if is_active != self.ui_state_active:
+            if not is_active:
+                self.progress.pack_forget()
+                self.input_entry.config(state="readonly")  # Keep input read-only
+                self.browse_input_btn.config(state="normal")
+                self.output_entry.config(state="normal")
+                self.browse_output_btn.config(state="normal")
+                self.voice_dropdown.config(state="normal")
+                self.convert_btn.config(state="normal", text="Convert to Speech", command=self.convert_to_speech)
+                self.stop_btn.config(state="disabled")
+                # Enable queue controls
+                self.add_to_queue_btn.config(state="normal")
+                self.clear_queue_btn.config(state="normal")
+                self.delete_selected_btn.config(state="normal")
+            else:
+                self.progress.pack(fill="x", pady=(10, 0))
+                self.input_entry.config(state="disabled")
+                self.browse_input_btn.config(state="disabled")
+                self.output_entry.config(state="disabled")
+                self.browse_output_btn.config(state="disabled")
+                self.voice_dropdown.config(state="disabled")
+                self.convert_btn.config(state="normal", text="Pause", command=self.abort_conversion_process)
+                self.stop_btn.config(state="normal")
+                # Disable queue controls during processing
+                self.add_to_queue_btn.config(state="disabled")
+                self.clear_queue_btn.config(state="disabled")
+                self.delete_selected_btn.config(state="disabled")
+            self.ui_state_active = is_active
         
         # Dispatch based on current state
         if current_state == AppState.PROCESSING:
@@ -1812,8 +1978,8 @@ class TextToSpeechApp:
             # Calculate total time if we have a start time
             if self.start_time is not None:
                 total_time = time.time() - self.start_time
-                total_mins, total_secs = divmod(int(total_time), 60)
-                total_time_str = f"Total time: {total_mins:02d}:{total_secs:02d}"
+                from tts_generator import format_duration
+                total_time_str = f"Total time: {format_duration(int(total_time))}"
             else:
                 total_time_str = ""
                 
@@ -1852,13 +2018,19 @@ class TextToSpeechApp:
         
     def _abort_conversion_ui(self):
         """Update UI when conversion is aborted"""
+        # _wait_for_worker updates the UI once the worker has actually stopped
         self.app_state.set_state(AppState.ERROR)
-        self._update_ui_state()
         
     def _stop_conversion_ui(self):
         """Update UI when conversion is stopped"""
         # State is already set to STOP in stop_conversion
-        self._update_ui_state()
+        if len(self.queue_items) > 0:
+            del self.queue_items[self.current_queue_index]
+            self.queue_tree.delete(self.queue_item_ids.pop(self.current_queue_index))
+            self.current_queue_index = 0
+        else:
+            print("Queue is already empty.")
+        # _wait_for_worker updates the UI once the worker has actually stopped
 
     def _on_closing(self):
         """Handle window closing event"""
@@ -1883,34 +2055,72 @@ class TextToSpeechApp:
         
     class ConsoleRedirector:
         """Redirect STDOUT to the console text box"""
+        # How often collected writes are inserted into the text widget; still looks live, while a worker
+        # printing every chunk costs at most ten layout passes a second
+        FLUSH_DELAY_MS = 100
+        # Older lines are dropped so a long conversion doesn't grow the widget without bound
+        MAX_LINES = 5000
+        
         def __init__(self, text_widget, original_stdout):
             self.text_widget = text_widget
             self.original_stdout = original_stdout
+            # Text written since the last flush; deque appends and pops are thread-safe without a lock.
+            # Bounded like the widget (print writes the text and the newline separately), so a stalled
+            # main loop can't pile up output that would be trimmed from the widget right away anyway.
+            self.pending = deque(maxlen=2 * self.MAX_LINES)
+            # Created on the main thread, so the flush loop runs there from the start
+            self.text_widget.after(self.FLUSH_DELAY_MS, self._flush_to_widget)
             
         def write(self, text):
-            # Insert text into the text widget
-            try:
-                self.text_widget.insert(tk.END, text)
-                self.text_widget.see(tk.END)  # Scroll to the end
-                self.text_widget.update()  # Update the GUI
-                # Also write to original stdout
-                self.original_stdout.write(text)
-            except tk.TclError as e:
-                # This can happen if the widget is destroyed while writing
-                # print(f"Warning: Tkinter widget error during console redirect: {e}")
-                pass
+            # Write to original stdout right away
+            self.original_stdout.write(text)
+            # Only queue the text here: write() is called from worker threads too, which must not touch Tk
+            self.pending.append(text)
+            
+        def _flush_to_widget(self):
+            """Insert all pending text into the text widget in one go (runs on the Tk main thread)"""
+            if self.pending:
+                parts = []
+                # Only take what is there now, since workers may keep appending while we drain
+                for _ in range(len(self.pending)):
+                    parts.append(self.pending.popleft())
+                # Follow new output only if the user was already at the bottom, not reading earlier lines
+                at_bottom = self.text_widget.yview()[1] > 0.98
+                self.text_widget.insert(tk.END, "".join(parts))
+                self.text_widget.delete('1.0', f'end - {self.MAX_LINES} lines')
+                if at_bottom:
+                    self.text_widget.see(tk.END)  # Scroll to the end
+            self.text_widget.after(self.FLUSH_DELAY_MS, self._flush_to_widget)
             
         def flush(self):
             # Flush the original stdout
             self.original_stdout.flush()
             
+    def _set_label_text(self, label, text):
+        """Set a label's text only when it changes, since sliders report every pixel of a drag"""
+        if self.label_texts.get(label) != text:
+            self.label_texts[label] = text
+            label.config(text=text)
+    
     def update_threshold_display(self, value):
         """Update the threshold value display"""
-        self.threshold_value_label.config(text=f"{float(value):.2f}")
+        self._set_label_text(self.threshold_value_label, f"{float(value):.2f}")
     
     def update_speed_display(self, value):
         """Update the speed value display"""
-        self.speed_value_label.config(text=f"{float(value):.1f}x")
+        self._set_label_text(self.speed_value_label, f"{float(value):.1f}x")
+    
+    def _debounce(self, key, delay_ms, callback):
+        """Run callback once, delay_ms after the last of a burst of calls with the same key"""
+        after_id = self.debounce_ids.pop(key, None)
+        if after_id is not None:
+            self.root.after_cancel(after_id)
+        
+        def run():
+            del self.debounce_ids[key]
+            callback()
+        
+        self.debounce_ids[key] = self.root.after(delay_ms, run)
     
     def _on_mp3_checkbox_changed(self, *args):
         """Handle MP3 checkbox state change to update output file extension"""
@@ -1925,20 +2135,21 @@ class TextToSpeechApp:
             
     def _on_batch_count_changed(self, *args):
         """Handle batch count changes to recreate pipelines in the worker"""
-        if self.pipeline_loaded and self.convert_worker:
+        if self.pipeline_loaded and self.convert_worker and self.convert_worker.pipelines:
             self.convert_worker.recreate_pipelines()
             
+    def _on_cpu_int8_changed(self, *args):
+        """Handle INT8 quantization changes by reloading the model on next use"""
+        if self.pipeline_loaded and self.convert_worker:
+            self.convert_worker.unload_pipelines()
+            
     def _on_language_changed(self, *args):
         """Handle language changes to filter voices and recreate pipelines"""
         selected_language = self.language_var.get()
         lang_code = self.language_codes.get(selected_language, "a")  # Default to American English
         
-        # Filter voices by selected language
-        filtered_voices = [
-            f"{voice} ({data['grade']})" 
-            for voice, data in self.voice_data.items() 
-            if data['lang_code'] == lang_code
-        ]
+        # Voices of the selected language
+        filtered_voices = VOICES_BY_LANG_CODE.get(lang_code, ())
         
         # Update voice dropdown values
         self.voice_dropdown['values'] = filtered_voices
@@ -1949,7 +2160,7 @@ class TextToSpeechApp:
             
         # Recreate pipelines with new language
         if self.pipeline_loaded and self.convert_worker:
-            self.convert_worker.recreate_pipelines(lang_code)
+            self.convert_worker.set_language(lang_code)
 
 def main():
     # Use TkinterDnD root window if available
@@ -1,9 +1,8 @@
 import os
-import json
+import time
 import traceback
-import threading
-from tts_generator import generate_long
-import soundfile as sf
+from text_processor import load_text_file, apply_text_transformations
+from tts_generator import format_duration
 
 
 class QueueWorker:
@@ -23,6 +22,12 @@ class QueueWorker:
             if 'start_conversion' in self.ui_callbacks:
                 self.ui_callbacks['start_conversion']()
             
+            # Convert several books at once in worker processes if requested
+            processes = min(self.app.parallel_books_var.get(), len(self.app.queue_items))
+            if processes > 1:
+                self.process_queue_parallel(processes)
+                return
+            
             # Process each item in the queue
             for i, queue_item in enumerate(self.app.queue_items):
                 
@@ -47,7 +52,12 @@ class QueueWorker:
                 
                 # Process this item using the app's convert worker
                 try:
-                    result = self.app.convert_worker.convert_file(input_path, output_path)
+                    text_content = apply_text_transformations(
+                        load_text_file(input_path),
+                        self.app.replace_newlines_var.get() or None,
+                        self.app.merge_paragraphs_var.get() or None
+                    )
+                    result = self.app.convert_worker.convert_file(text_content, output_path)
                     if result:
                         # If we get here without exception, the item completed successfully
                         queue_item['status'] = '✅ Completed'
@@ -83,5 +93,106 @@ class QueueWorker:
             traceback.print_exc()
             if 'error_conversion' in self.ui_callbacks:
                 self.ui_callbacks['error_conversion'](str(e))
+
+    @staticmethod
+    def _input_size(input_path):
+        """Size of an input file in bytes, as a cheap estimate of how long it takes to convert"""
+        try:
+            return os.path.getsize(input_path)
+        except OSError:
+            return 0
     
-    
\ No newline at end of file
+    def process_queue_parallel(self, processes):
+        """Process the queue with one book per worker process, several books at a time"""
+        # Import here to avoid slowing down app startup
+        import torch
+        from convert_pool import ConvertPool
+        
+        start_time = time.time()
+        self.app.start_time = start_time
+        
+        # Snapshot the settings once, since the workers can't read the Tk variables
+        cfg = {
+            'voice': self.app.voice_var.get().split(" (")[0],  # Extract voice identifier before the grade
+            'speed': self.app.speed_var.get(),
+            'sample_rate': self.app.sample_rate_var.get(),
+            'threshold': self.app.threshold_var.get(),
+            'margin': self.app.margin_var.get(),
+            'max_chunk_length': self.app.max_chunk_length_var.get(),
+            'lang_code': self.app.convert_worker.lang_code,
+            'convert_to_mp3': self.app.convert_to_mp3_var.get(),
+            'mp3_bitrate': self.app.mp3_bitrate_var.get(),
+            'half_precision': self.app.half_precision_var.get(),
+            'cpu_int8': self.app.cpu_int8_var.get(),
+            'replace_newlines': self.app.replace_newlines_var.get(),
+            'merge_paragraphs': self.app.merge_paragraphs_var.get()
+        }
+        
+        gpu_count = torch.cuda.device_count() if torch.cuda.is_available() else 0
+        print(f"Converting {len(self.app.queue_items)} queue items with {processes} worker processes...")
+        pool = ConvertPool(processes, gpu_count)
+        # Idle workers pull the next book from the pool's shared queue, so hand out the biggest books
+        # first; otherwise one long book started last can keep a single worker busy while the rest sit idle
+        order = sorted(
+            range(len(self.app.queue_items)),
+            key=lambda i: self._input_size(self.app.queue_items[i]['input_file']),
+            reverse=True
+        )
+        results = [None] * len(self.app.queue_items)
+        try:
+            for i in order:
+                queue_item = self.app.queue_items[i]
+                results[i] = pool.submit(i, queue_item['input_file'], queue_item['output_file'], cfg)
+            self.app.current_queue_index = 0
+        
+            # Relay worker progress to the UI until every book is done
+            book_progress = [0.0] * len(results)
+            aborted = False
+            while True:
+                all_ready = all(result.done() for result in results)
+                for message in pool.get_messages():
+                    if message[0] == 'started':
+                        i = message[1]
+                        self.app.queue_items[i]['status'] = '⚙️ Processing'
+                        if 'update_queue_item_status' in self.ui_callbacks:
+                            self.ui_callbacks['update_queue_item_status'](i, '⚙️ Processing')
+                    elif message[0] == 'progress':
+                        _, i, fraction, progress_msg = message
+                        book_progress[i] = fraction
+                        overall = sum(book_progress) / len(book_progress)
+                        elapsed_time = time.time() - start_time
+                        remaining_time = elapsed_time / overall - elapsed_time if overall > 0 else 0
+                        if 'update_progress' in self.ui_callbacks:
+                            self.ui_callbacks['update_progress'](
+                                f"Book {i+1}: {progress_msg}",
+                                f"Elapsed: {format_duration(int(elapsed_time))} | Remaining: {format_duration(int(remaining_time))}",
+                                overall
+                            )
+            
+                if self.app.app_state.is_aborted and not aborted:
+                    print("Queue processing aborted by user")
+                    pool.abort(create_lockfile=self.app.app_state.should_create_lockfile)
+                    aborted = True
+                if all_ready:
+                    break
+        finally:
+            if not all(result is not None and result.done() for result in results):
+                # Relaying failed: let running books stop after their current batch, leaving lockfiles
+                pool.abort()
+                pool.close(wait=False)
+            else:
+                pool.close()
+        
+        for i, result in enumerate(results):
+            try:
+                status = '✅ Completed' if result.result() is not None else '⏸️ Paused'
+            except Exception as e:
+                print(f"Queue item {i+1} failed: {e}")
+                status = '❌ Failed'
+            self.app.queue_items[i]['status'] = status
+            if 'update_queue_item_status' in self.ui_callbacks:
+                self.ui_callbacks['update_queue_item_status'](i, status)
+        
+        # Update UI for queue completion
+        if 'finish_queue_processing' in self.ui_callbacks:
+            self.ui_callbacks['finish_queue_processing']()
@@ -0,0 +1,7 @@
+#!/bin/sh
+# Start the app with Homebrew's ffmpeg 6 libraries on the dynamic loader path,
+# so main.py doesn't have to preload them itself
+FFMPEG_LIB_PATH=/opt/homebrew/opt/ffmpeg@6/lib
+export DYLD_LIBRARY_PATH="$FFMPEG_LIB_PATH${DYLD_LIBRARY_PATH:+:$DYLD_LIBRARY_PATH}"
+
+cd "$(dirname "$0")" && exec uv run main.py "$@"
@@ -1,4 +1,8 @@
+import os
 import re
+import mmap
+import shutil
+import subprocess
 import nltk
 from nltk.tokenize import sent_tokenize, RegexpTokenizer
 import unicodedata
@@ -50,37 +54,47 @@ def is_unwanted_unicode(char):
         
     return False
 
+# Unicode blocks whose characters are spoken as their names (e.g. "∑" becomes " n-ary summation ")
+SPOKEN_SYMBOL_BLOCKS = {
+    'Mathematical Operators': range(0x2200, 0x22FF),
+    'Supplemental Mathematical Operators': range(0x2A00, 0x2AFF),
+    'Mathematical Alphanumeric Symbols': range(0x1D400, 0x1D7FF),
+    'Letterlike Symbols': range(0x2100, 0x214F),
+    'Miscellaneous Mathematical Symbols-A': range(0x27C0, 0x27EF),
+    'Miscellaneous Mathematical Symbols-B': range(0x2980, 0x29FF),
+    'Miscellaneous Technical': range(0x2300, 0x23FF),
+    'Geometric Shapes': range(0x25A0, 0x25FF),
+    'Combining Diacritical Marks for Symbols': range(0x20D0, 0x20EF),
+    'Arabic Mathematical Alphabetic Symbols': range(0x1EE00, 0x1EEFF),
+    'Superscripts and Subscripts': [0x00B2, 0x00B3, 0x00B9] + list(range(0x2070, 0x209F))
+}
+SPOKEN_SYMBOLS = frozenset(code for codes in SPOKEN_SYMBOL_BLOCKS.values() for code in codes)
+
+class UnicodeCleaningTable(dict):
+    """str.translate table for clean_unicode_text, working out each character's replacement the first time it is seen"""
+
+    def __missing__(self, code):
+        char = chr(code)
+        if char in ("\xc2", "\xa0"):
+            # Replace special characters
+            replacement = " "
+        elif code in SPOKEN_SYMBOLS and unicodedata.name(char, None):
+            # Replace the character with its word equivalent, preserving spacing
+            replacement = f' {unicodedata.name(char).lower()} '
+        elif is_unwanted_unicode(char):
+            replacement = None
+        else:
+            replacement = char
+        self[code] = replacement
+        return replacement
+
+UNICODE_CLEANING_TABLE = UnicodeCleaningTable()
+
 def clean_unicode_text(text):
     """Remove unwanted unicode characters while preserving multilingual text"""
-    # Filter out unwanted unicode characters
-    # Replace special characters with their word equivalents
-    # Replace special characters
-    text = text.replace("\xc2", " ")
-    text = text.replace("\xa0", " ")
-    block_ranges = {
-        'Mathematical Operators': range(0x2200, 0x22FF),
-        'Supplemental Mathematical Operators': range(0x2A00, 0x2AFF),
-        'Mathematical Alphanumeric Symbols': range(0x1D400, 0x1D7FF),
-        'Letterlike Symbols': range(0x2100, 0x214F),
-        'Miscellaneous Mathematical Symbols-A': range(0x27C0, 0x27EF),
-        'Miscellaneous Mathematical Symbols-B': range(0x2980, 0x29FF),
-        'Miscellaneous Technical': range(0x2300, 0x23FF),
-        'Geometric Shapes': range(0x25A0, 0x25FF),
-        'Combining Diacritical Marks for Symbols': range(0x20D0, 0x20EF),
-        'Arabic Mathematical Alphabetic Symbols': range(0x1EE00, 0x1EEFF),
-        'Superscripts and Subscripts': [0x00B2, 0x00B3, 0x00B9] + list(range(0x2070, 0x209F))
-    }
-    for block, ur in block_ranges.items():
-        print(f"Translating {block}")
-        for c in ur:
-            # Replace the character with its word equivalent, preserving spacing
-            try:
-                text = re.sub(str(chr(c)), f' {unicodedata.name(chr(c)).lower()} ', text)
-            except:
-                pass
-    
-    cleaned_text = ''.join(char for char in text if not is_unwanted_unicode(char))
-    return cleaned_text
+    # Replace special characters and symbols with their word equivalents, and filter out unwanted
+    # unicode characters, all in one pass; each distinct character is only classified once
+    return text.translate(UNICODE_CLEANING_TABLE)
 
 def convert_math_and_tables(text):
     """
@@ -296,23 +310,39 @@ def split_long_sentence(sentence, max_chars=250):
     return split_into_word_chunks_nltk(sentence, max_chars)
 
 
+# A run of characters between newlines, i.e. one paragraph of the input
+PARAGRAPH_PATTERN = re.compile(r'[^\n]+')
+
+_punkt_checked = False
+
+def ensure_punkt_tokenizer():
+    """Download the punkt tokenizer the first time it's needed instead of contacting the NLTK index on every split"""
+    global _punkt_checked
+    if _punkt_checked:
+        return
+    try:
+        nltk.data.find('tokenizers/punkt_tab')
+    except LookupError:
+        try:
+            # Download punkt tokenizer if not already downloaded
+            nltk.download('punkt_tab', quiet=False)
+        except:
+            pass  # If download fails, continue anyway
+    _punkt_checked = True
+
 def split_text(text, max_chunk_length=200):
     """Split text into chunks suitable for Kokoro processing"""
     # Clean up extra spaces that might have been created
     text = text.strip()  # Remove leading/trailing whitespace
     
-    try:
-        # Download punkt tokenizer if not already downloaded
-        nltk.download('punkt_tab', quiet=False)
-    except:
-        pass  # If download fails, continue anyway
+    ensure_punkt_tokenizer()
     
     chunks = []
     
-    # First, split by newlines to handle paragraph breaks
-    paragraphs = text.split('\n')
-            
-    for paragraph in paragraphs:
+    # First, split by newlines to handle paragraph breaks, walking the lines lazily
+    # instead of building a list of every paragraph in the book up front
+    for paragraph_match in PARAGRAPH_PATTERN.finditer(text):
+        paragraph = paragraph_match.group()
         # Skip empty paragraphs
         if not paragraph.strip():
             continue
@@ -348,6 +378,9 @@ def split_text(text, max_chunk_length=200):
                     
     return chunks
 
+# A newline that isn't part of a run of newlines, i.e. a line break inside a paragraph
+SINGLE_NEWLINE_PATTERN = re.compile(r'(?<!\n)\n(?!\n)')
+
 def apply_text_transformations(original_text_content, replace_newlines_var=None, merge_paragraphs_var=None, convert_math_var=None):
     """Apply all selected text transformations"""
     # Start with original content
@@ -355,13 +388,8 @@ def apply_text_transformations(original_text_content, replace_newlines_var=None,
     
     # Apply newline replacement if selected
     if replace_newlines_var is not None:
-        # Replace single newlines with spaces, preserving double newlines
-        # First, temporarily replace double newlines with a placeholder
-        temp_content = content.replace('\n\n', 'DOUBLE_NEWLINE_PLACEHOLDER')
-        # Replace single newlines with spaces
-        temp_content = temp_content.replace('\n', ' ')
-        # Restore double newlines
-        content = temp_content.replace('DOUBLE_NEWLINE_PLACEHOLDER', '\n\n')
+        # Replace single newlines with spaces, preserving double newlines, in one pass over the text
+        content = SINGLE_NEWLINE_PATTERN.sub(' ', content)
     
     # Apply paragraph merging if selected
     if merge_paragraphs_var is not None:
@@ -376,3 +404,69 @@ def apply_text_transformations(original_text_content, replace_newlines_var=None,
         content = convert_math_and_tables(content)
     
     return content
+
+def convert_to_text_with_pandoc(file_path):
+    """Convert EPUB, HTML, PDF, or DocX files to plain text using pandoc"""
+    try:
+        # Check if pandoc is available
+        if shutil.which("pandoc") is None:
+            raise Exception("Pandoc is not installed or not available in PATH")
+        
+        # Determine the format based on file extension
+        ext = os.path.splitext(file_path)[1].lower()
+        if ext == '.epub':
+            format_arg = 'epub'
+        elif ext == '.html' or ext == '.htm':
+            format_arg = 'html'
+        elif ext == '.pdf':
+            format_arg = 'pdf'
+        elif ext == '.docx':
+            format_arg = 'docx'
+        elif ext == '.rtf':
+            format_arg = 'rtf'
+        elif ext == '.md':
+            format_arg = 'gfm'
+        else:
+            # For plain text files, no conversion needed
+            with open(file_path, 'r', encoding='utf-8') as file:
+                return file.read()
+        
+        # Run pandoc to convert to plain text
+        result = subprocess.run([
+            'pandoc',
+            '--from', format_arg,
+            '--to', 'plain',
+            '--wrap', 'none',  # Prevent line wrapping
+            file_path
+        ], capture_output=True, text=True, check=True)
+        
+        return result.stdout
+    except subprocess.CalledProcessError as e:
+        raise Exception(f"Pandoc conversion failed: {e.stderr}")
+    except FileNotFoundError:
+        raise Exception("Pandoc is not installed or not available in PATH")
+    except Exception as e:
+        raise Exception(f"Error converting file: {str(e)}")
+
+def load_text_file(file_path):
+    """Load a book as cleaned plain text, converting it with pandoc first if needed"""
+    # Get file extension
+    ext = os.path.splitext(file_path)[1].lower()
+    
+    # Convert file to text if it's not already plain text
+    if ext in ['.epub', '.html', '.htm', '.pdf', '.docx']:
+        content = convert_to_text_with_pandoc(file_path)
+    else:
+        # For plain text files, decode straight from a memory map so a large book
+        # isn't held in memory as both raw bytes and text while loading
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                content = ""  # mmap can't map an empty file
+            else:
+                with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    content = str(mm, 'utf-8')
+        # Decoding bytes skips text mode's newline translation, so normalize Windows and old Mac line endings here
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    
+    # Clean unwanted unicode characters while preserving multilingual text
+    return clean_unicode_text(content)
@@ -1,4 +1,5 @@
 import contextlib
+import functools
 import os
 import time
 import soundfile as sf
@@ -6,6 +7,205 @@ import numpy as np
 from text_processor import split_text
 import threading
 
+@functools.lru_cache(maxsize=256)
+def format_duration(seconds):
+    """Format whole seconds as MM:SS; the same values come up on every progress update, so they're cached"""
+    mins, secs = divmod(seconds, 60)
+    return f"{mins:02d}:{secs:02d}"
+
+def float_to_pcm16(audio, scratch=None, out=None):
+    """
+    Quantize float audio in [-1, 1] to 16-bit PCM, rounding the same way libsndfile does
+    
+    Args:
+        audio: float numpy array, never modified (cached audio like the outro is passed in)
+        scratch: optional float32 array of the same shape to do the math in
+        out: optional int16 array of the same shape to write the result to
+    """
+    # Scale first and clip to the scaled range, so every step after the first runs in place
+    scratch = np.multiply(audio, 32767, out=scratch, dtype=np.float32)
+    np.clip(scratch, -32767, 32767, out=scratch)
+    np.rint(scratch, out=scratch)
+    if out is None:
+        return scratch.astype('<i2')
+    np.copyto(out, scratch, casting='unsafe')
+    return out
+
+class AudioRingBuffer:
+    """Fixed-capacity single-producer/single-consumer ring of audio chunks"""
+
+    def __init__(self, capacity):
+        self._slots = [None] * capacity
+        self._capacity = capacity
+        # Only the producer moves the head and only the consumer moves the tail, so neither needs a lock;
+        # the semaphores count free and filled slots and make the threads sleep instead of spinning
+        self._head = 0
+        self._tail = 0
+        self._free = threading.Semaphore(capacity)
+        self._filled = threading.Semaphore(0)
+
+    def put(self, item):
+        """Add an item, blocking while the ring is full (producer side only)"""
+        self._free.acquire()
+        self._slots[self._head] = item
+        self._head = (self._head + 1) % self._capacity
+        self._filled.release()
+
+    def get(self):
+        """Remove the oldest item, blocking while the ring is empty (consumer side only)"""
+        self._filled.acquire()
+        item = self._slots[self._tail]
+        self._slots[self._tail] = None  # Drop the reference so written audio can be freed
+        self._tail = (self._tail + 1) % self._capacity
+        self._free.release()
+        return item
+
+class SoundFileWriter:
+    """Write audio to a SoundFile from a background thread so synthesis never waits on disk I/O"""
+
+    def __init__(self, soundfile, max_pending=4, mirror=None):
+        self.soundfile = soundfile
+        # Optional callable that also receives every written chunk as 16-bit PCM (e.g. a streaming MP3 encoder).
+        # It must consume the samples before returning, since their buffer is reused for the next chunk.
+        self.mirror = mirror
+        # Quantize 16-bit files ourselves so libsndfile can copy the samples straight through
+        self.write_pcm16 = soundfile.subtype == 'PCM_16'
+        # Buffers reused for every chunk's conversion, grown when a longer chunk comes along
+        self._scratch = np.empty(0, dtype=np.float32)
+        self._pcm = np.empty(0, dtype='<i2')
+        self._ring = AudioRingBuffer(max_pending)
+        self._error = None
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._write_loop, daemon=True)
+        self._thread.start()
+
+    def _write_loop(self):
+        """Drain queued audio into the sound file until the end sentinel arrives"""
+        while True:
+            audio = self._ring.get()
+            if audio is None:
+                break
+            try:
+                if self.write_pcm16 or self.mirror is not None:
+                    # Convert once and share the result between the file and the mirror
+                    pcm = self._to_pcm16(audio)
+                if self.write_pcm16:
+                    self.soundfile.buffer_write(pcm, dtype='int16')
+                else:
+                    self.soundfile.write(audio)
+                if self.mirror is not None:
+                    self.mirror(pcm)
+            except Exception as e:
+                # Keep draining so producers never block, but report the error on the next write
+                self._error = e
+
+    def _to_pcm16(self, audio):
+        """Convert a chunk to 16-bit PCM in the reused buffers; the result is only valid until the next chunk"""
+        if self._scratch.size < audio.size:
+            self._scratch = np.empty(audio.size, dtype=np.float32)
+            self._pcm = np.empty(audio.size, dtype='<i2')
+        scratch = self._scratch[:audio.size].reshape(audio.shape)
+        pcm = self._pcm[:audio.size].reshape(audio.shape)
+        return float_to_pcm16(audio, scratch=scratch, out=pcm)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def seek(self, frames, whence=sf.SEEK_SET):
+        """Seek the underlying sound file (only safe before anything has been written)"""
+        return self.soundfile.seek(frames, whence)
+
+    def write(self, audio):
+        """Queue audio to be written, blocking only if the writer has fallen behind"""
+        if self._error is not None:
+            raise self._error
+        self._ring.put(audio)
+
+    def close(self):
+        """Flush all pending audio to disk and close the sound file"""
+        with self._close_lock:
+            if self._thread.is_alive():
+                self._ring.put(None)
+                self._thread.join()
+            self.soundfile.close()
+        if self._error is not None:
+            raise self._error
+
+class ChunkScheduler:
+    """Synthesize a book's chunks on several batch slots at once, handing each free slot the next chunk in order"""
+
+    def __init__(self, chunks, start_idx, slot_count, run_chunk, lookahead):
+        self.chunks = chunks
+        # Slots may run this many chunks ahead of the writer, so finished audio can't pile up behind a slow chunk
+        self.lookahead = lookahead
+        self._next_chunk = start_idx
+        self._next_write = start_idx
+        self._results = {}  # Chunk index -> (audio, error), until the writer takes it
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._threads = [
+            threading.Thread(target=self._slot_loop, args=(slot, run_chunk), daemon=True)
+            for slot in range(slot_count)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _slot_loop(self, slot, run_chunk):
+        """Keep one slot busy with the next unclaimed chunk, instead of waiting for the rest of a batch to finish"""
+        while True:
+            with self._condition:
+                while (not self._stopped and self._next_chunk < len(self.chunks) and
+                       self._next_chunk >= self._next_write + self.lookahead):
+                    self._condition.wait()
+                if self._stopped or self._next_chunk >= len(self.chunks):
+                    return
+                idx = self._next_chunk
+                self._next_chunk += 1
+
+            try:
+                result = (run_chunk(slot, self.chunks[idx]), None)
+            except Exception as e:
+                result = (None, e)
+
+            with self._condition:
+                self._results[idx] = result
+                self._condition.notify_all()
+
+    def get(self, idx):
+        """Wait for chunk idx's audio (chunks must be taken in order), raising its error if it failed"""
+        with self._condition:
+            while idx not in self._results:
+                self._condition.wait()
+            audio, error = self._results.pop(idx)
+            self._next_write = idx + 1
+            self._condition.notify_all()
+        if error is not None:
+            raise error
+        return audio
+
+    def close(self):
+        """Stop handing out chunks and wait for the slots to finish the ones they are on"""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+        for thread in self._threads:
+            thread.join()
+
+# Samples checked at a time when scanning inward for the first and last loud sample (about 170 ms at 24 kHz)
+TRIM_SCAN_STEP = 4096
+
+def _loud_mask(audio_data, threshold):
+    """Mark loud frames of (time,) or (time, channels) audio; a frame counts as loud if any channel is"""
+    # Mono audio is compared as a flat view, skipping both the float copy np.abs makes and a reduction
+    # over a single channel
+    if audio_data.ndim == 1 or audio_data.shape[1] == 1:
+        samples = audio_data.reshape(-1)
+        return (samples > threshold) | (samples < -threshold)
+    return (np.abs(audio_data) > threshold).any(axis=1)
+
 def trim_silence(audio_data, threshold=0.06, margin=100):
     """
     Trim leading and trailing silence from audio data
@@ -16,27 +216,68 @@ def trim_silence(audio_data, threshold=0.06, margin=100):
         margin: samples to keep before and after detected sound
     """
     
-    # Find first non-silence sample
-    non_silence_indices = np.where(np.abs(audio_data) > threshold)[0]
-    
-    # Trim leading silence with margin
-    if len(non_silence_indices) > 0:
-        start_idx = max(0, non_silence_indices[0] - margin*2)
-        end_idx = min(len(audio_data), non_silence_indices[-1] + margin*10)
-        return audio_data[start_idx:end_idx]
-    else:
+    # Only the edges are trimmed, so scan inward from each end a step at a time and stop at the first
+    # step with a loud sample, then find the exact sample inside it; the speech in between is never compared
+    first_loud = None
+    for start in range(0, len(audio_data), TRIM_SCAN_STEP):
+        loud = _loud_mask(audio_data[start:start + TRIM_SCAN_STEP], threshold)
+        if loud.any():
+            first_loud = start + int(loud.argmax())
+            break
+    if first_loud is None:
         return audio_data
+    
+    last_loud = first_loud
+    for end in range(len(audio_data), first_loud, -TRIM_SCAN_STEP):
+        loud = _loud_mask(audio_data[max(first_loud, end - TRIM_SCAN_STEP):end], threshold)
+        if loud.any():
+            last_loud = end - 1 - int(loud[::-1].argmax())
+            break
+    
+    # Trim leading and trailing silence with margin
+    start_idx = max(0, first_loud - margin*2)
+    end_idx = min(len(audio_data), last_loud + margin*10)
+    return audio_data[start_idx:end_idx]
+
+@functools.lru_cache(maxsize=None)
+def pause_audio(sample_rate):
+    """Half a second of silence, shared by every pause marker instead of allocated per marker"""
+    pause = np.zeros((int(sample_rate*0.5), 1), dtype=np.float32)  # shape (time, channels)
+    # Read-only, since the same array is written for every pause in the book
+    pause.setflags(write=False)
+    return pause
+
+@functools.lru_cache(maxsize=None)
+def get_resampler(sample_rate, device):
+    """The 24 kHz to sample_rate resampler on device, built once so its sinc filter kernel is reused for every chunk"""
+    import torchaudio
+    return torchaudio.transforms.Resample(24000, sample_rate).to(device)
+
+def resample_audio(audio, sample_rate, device=None):
+    """Resample Kokoro's 24 kHz mono audio tensor to sample_rate, on the model's device if it has an accelerator"""
+    if device is not None and device.type != 'cpu':
+        # The filter is a convolution over the whole chunk, which the GPU does much faster; the caller copies back once
+        return get_resampler(sample_rate, device)(audio.to(device))
+    
+    # On the CPU, soxr's polyphase resampler is many times faster than torchaudio's sinc convolution,
+    # especially for uneven ratios like 24 kHz to 44.1 kHz
+    import soxr
+    import torch
+    return torch.from_numpy(soxr.resample(audio.cpu().numpy(), 24000, sample_rate, quality='HQ'))
+
+# Chunks quieter than this overall (e.g. text that was only punctuation) are dropped instead of written
+SILENT_CHUNK_DBFS = -80
+SILENT_CHUNK_RMS = 10 ** (SILENT_CHUNK_DBFS / 20)
 
-def process_chunk(pipeline, chunk, voice, threshold=0.06, margin=10, speed=1.0, sample_rate=24000):
-    """Process a single chunk and return the audio tensor or a pause marker"""
+def process_chunk(pipeline, chunk, voice, threshold=0.06, margin=10, speed=1.0, sample_rate=24000, stream=None, half_precision=False):
+    """Process a single chunk and return the audio tensor or a pause marker, or None if the chunk came out silent"""
     # Import torch here to avoid slowing down app startup
     import torch
     
     # Check if this is a pause marker
     if chunk == "SENTENCE_END_PAUSE_MARKER":
-        # Create a pause instead of audio
-        pause = torch.zeros((int(sample_rate*0.5), 1))  # shape (time, channels)
-        return pause.cpu().numpy()
+        # Use a pause instead of audio
+        return pause_audio(sample_rate)
     
     max_retries = 10
     retry_count = 0
@@ -45,11 +286,27 @@ def process_chunk(pipeline, chunk, voice, threshold=0.06, margin=10, speed=1.0,
         try:
             # Generate audio for this chunk using kokoro
             # Kokoro's API returns a generator, so we need to extract the audio
-            generator = pipeline(chunk, voice=voice, speed=speed)
-            # Get the first (and typically only) result from the generator
-            result = next(generator)
+            # Run on this batch slot's own CUDA stream (if any) so slots sharing the model overlap on the GPU
+            # Inference mode also skips the version counter and view tracking that no_grad still does
+            with torch.inference_mode(), torch.cuda.stream(stream) if stream is not None else contextlib.nullcontext():
+                # Autocast keeps the voice pack and audio in FP32 while matmuls/convs run in half precision:
+                # FP16 on GPUs, BF16 on the CPU where FP16 matmuls aren't accelerated
+                device_type = pipeline.model.device.type
+                half_dtype = torch.bfloat16 if device_type == 'cpu' else torch.float16
+                with torch.autocast(device_type=device_type, dtype=half_dtype, enabled=half_precision):
+                    generator = pipeline(chunk, voice=voice, speed=speed)
+                    # Get the first (and typically only) result from the generator
+                    result = next(generator)
             # The result is a tuple (grapheme_segment, phoneme_segment, audio_tensor)
-            audio = result[2]  # Extract the audio tensor
+            audio = result[2].float()  # Extract the audio tensor (in FP32 even under autocast)
+            
+            # Skip resampling, trimming and writing a chunk with nothing audible in it
+            if audio.square().mean().sqrt().item() < SILENT_CHUNK_RMS:
+                return None
+            
+            # Resample audio if needed, while it still has time on the last axis the way Kokoro returns it
+            if sample_rate != 24000:  # Kokoro default is 24000 Hz
+                audio = resample_audio(audio, sample_rate, pipeline.model.device)
             
             # Ensure audio tensor has the correct shape (time, channels)
             if audio.dim() == 1:
@@ -57,11 +314,6 @@ def process_chunk(pipeline, chunk, voice, threshold=0.06, margin=10, speed=1.0,
             elif audio.dim() == 2 and audio.shape[0] < audio.shape[1]:
                 audio = audio.T  # Transpose if needed to get (time, channels) format
             
-            # Resample audio if needed
-            if sample_rate != 24000:  # Kokoro default is 24000 Hz
-                import torchaudio
-                audio = torchaudio.functional.resample(audio.T, 24000, sample_rate).T
-            
             # Load audio onto cpu, convert to numpy, trim leading silence to reduce awkward pauses, then return it.
             return trim_silence(audio.cpu().numpy(), threshold=threshold, margin=margin)
         except Exception as e:
@@ -75,7 +327,7 @@ def process_chunk(pipeline, chunk, voice, threshold=0.06, margin=10, speed=1.0,
     return None
 
 
-def generate_long(pipelines, text, current_soundfile, output_path, voice='af_heart', start_time=None, start_chunk_idx=0, sf_mode='w', threshold=0.06, margin=10, speed=1.0, sample_rate=24000, batch_count=1, max_chunk_length=200):
+def generate_long(pipelines, text, current_soundfile, output_path, voice='af_heart', start_time=None, start_chunk_idx=0, sf_mode='w', threshold=0.06, margin=10, speed=1.0, sample_rate=24000, batch_count=1, max_chunk_length=200, streams=None, outro_audio=None, half_precision=False):
     """Generate long-form speech with resume capability and parallel batch processing"""
     # Get lockfile path
     lockfile_path = output_path + ".lock"
@@ -86,80 +338,86 @@ def generate_long(pipelines, text, current_soundfile, output_path, voice='af_hea
     print("\n".join(sentence_chunks))
     
     total_chunks = len(sentence_chunks)
+    lockfile_removed = False
     
     with current_soundfile as f:
         # If resuming, seek to end of file
         if sf_mode == 'r+':
             f.seek(0, sf.SEEK_END)
         
-        # Process chunks in batches using for loop and slices
-        for batch_start_idx in range(start_chunk_idx, len(sentence_chunks), batch_count):
-            # Determine the end index for this batch
-            batch_end_idx = min(batch_start_idx + batch_count, len(sentence_chunks))
-            
-            # Get chunks for this batch
-            batch_chunks = sentence_chunks[batch_start_idx:batch_end_idx]
-            
-            # Process chunks in parallel using threading
-            batch_results = [None] * len(batch_chunks)
-            threads = []
-            
-            def process_chunk_thread(i, chunk):
-                # Use the corresponding pipeline for this chunk (round-robin)
-                pipeline_idx = i % len(pipelines)
-                result = process_chunk(pipelines[pipeline_idx], chunk, voice, threshold=threshold, margin=margin, speed=speed, sample_rate=sample_rate)
-                batch_results[i] = result
-            
-            # Create and start threads for each chunk in the batch
-            for i, chunk in enumerate(batch_chunks):
-                thread = threading.Thread(target=process_chunk_thread, args=(i, chunk))
-                threads.append(thread)
-                thread.start()
-            
-            # Wait for all threads to complete
-            for thread in threads:
-                thread.join()
-            
-            # Write results to file in order
-            for i, result in enumerate(batch_results):
-                if result is not None:
-                    f.write(result)
+        def run_chunk(slot, chunk):
+            # Each batch slot always drives the same pipeline, and its own CUDA stream (if any)
+            pipeline_idx = slot % len(pipelines)
+            stream = streams[pipeline_idx] if streams else None
+            return process_chunk(pipelines[pipeline_idx], chunk, voice, threshold=threshold, margin=margin, speed=speed, sample_rate=sample_rate, stream=stream, half_precision=half_precision)
+        
+        if batch_count > 1:
+            # Kokoro's model only takes one sequence per forward pass (its duration alignment is built
+            # per utterance), so parallel batches run as concurrent slots on the shared model instead of one padded call
+            scheduler = ChunkScheduler(sentence_chunks, start_chunk_idx, batch_count, run_chunk, lookahead=2 * batch_count)
+            get_audio = scheduler.get
+        else:
+            # Nothing to overlap, so skip the threads
+            scheduler = None
+            get_audio = lambda idx: run_chunk(0, sentence_chunks[idx])
+        
+        try:
+            # Write and report chunks in batches using for loop and slices
+            for batch_start_idx in range(start_chunk_idx, len(sentence_chunks), batch_count):
+                # Determine the end index for this batch
+                batch_end_idx = min(batch_start_idx + batch_count, len(sentence_chunks))
+                
+                # Get chunks for this batch
+                batch_chunks = sentence_chunks[batch_start_idx:batch_end_idx]
+                
+                # Write results to file in order
+                for idx in range(batch_start_idx, batch_end_idx):
+                    result = get_audio(idx)
+                    if result is not None:
+                        f.write(result)
                     del result
                 
-                # Remove lockfile if this was the last chunk that previously failed
-                if batch_start_idx + i >= start_chunk_idx:
-                    if os.path.exists(lockfile_path):
+                # Remove the lockfile once the chunk that previously failed has been redone
+                if not lockfile_removed:
+                    try:
                         os.remove(lockfile_path)
+                    except OSError:
+                        pass
+                    lockfile_removed = True
 
-            # After completing the entire batch, update time estimates based on batches
-            # Calculate batch progress for timing estimates
-            completed_batches = (batch_start_idx // batch_count) + 1
-            total_batches = (total_chunks + batch_count - 1) // batch_count  # Ceiling division
-            elapsed_time = time.time() - start_time if start_time else 0
-            estimated_total_time = (elapsed_time / completed_batches) * total_batches if completed_batches > 0 else 0
-            remaining_time = estimated_total_time - elapsed_time if completed_batches > 0 else 0
+                # After completing the entire batch, update time estimates based on batches
+                # Calculate batch progress for timing estimates
+                completed_batches = (batch_start_idx // batch_count) + 1
+                total_batches = (total_chunks + batch_count - 1) // batch_count  # Ceiling division
+                elapsed_time = time.time() - start_time if start_time else 0
+                estimated_total_time = (elapsed_time / completed_batches) * total_batches if completed_batches > 0 else 0
+                remaining_time = estimated_total_time - elapsed_time if completed_batches > 0 else 0
             
-            # Format time for display
-            elapsed_mins, elapsed_secs = divmod(int(elapsed_time), 60)
-            remaining_mins, remaining_secs = divmod(int(remaining_time), 60)
+                timer_msg = f"Elapsed: {format_duration(int(elapsed_time))} | Remaining: {format_duration(int(remaining_time))} | Batch {completed_batches}/{total_batches}"
             
-            timer_msg = f"Elapsed: {elapsed_mins:02d}:{elapsed_secs:02d} | Remaining: {remaining_mins:02d}:{remaining_secs:02d} | Batch {completed_batches}/{total_batches}"
-            
-            # Create a string of the first 50 characters of concatenated non-pause chunks in this batch
-            batch_text = ""
+                # Create a string of the first 50 characters of concatenated non-pause chunks in this batch
+                batch_text = ""
 
-            for chunk in batch_chunks:
-                if chunk != "SENTENCE_END_PAUSE_MARKER":
-                    batch_text += chunk + " "
+                for chunk in batch_chunks:
+                    if chunk != "SENTENCE_END_PAUSE_MARKER":
+                        batch_text += chunk + " "
             
-            batch_text_display = batch_text[:50].strip()
-            if len(batch_text) > 50:
-                batch_text_display += "..."
+                batch_text_display = batch_text[:50].strip()
+                if len(batch_text) > 50:
+                    batch_text_display += "..."
             
-            # Update the last yielded progress with batch timing information
-            yield {
-                'progress_msg': f"Completed batch {completed_batches}/{total_batches}: {batch_text_display}",
-                'timer_msg': timer_msg,
-                'processed_chunks': min(batch_end_idx, total_chunks),  # Number of chunks processed so far
-                'total_chunks': total_chunks
-            }
+                # Update the last yielded progress with batch timing information
+                yield {
+                    'progress_msg': f"Completed batch {completed_batches}/{total_batches}: {batch_text_display}",
+                    'timer_msg': timer_msg,
+                    'processed_chunks': min(batch_end_idx, total_chunks),  # Number of chunks processed so far
+                    'total_chunks': total_chunks
+                }
+
+        finally:
+            if scheduler is not None:
+                scheduler.close()
+        
+        # Only reached once every chunk has been written, so a paused book never gets the outro
+        if outro_audio is not None:
+            f.write(outro_audio)
@@ -1,5 +1,10 @@
+from collections import namedtuple
+
+# A voice's quality grade, language name and Kokoro language code
+Voice = namedtuple('Voice', 'grade language lang_code')
+
 # Voice data with grades and language codes
-VOICE_DATA = {
+_VOICE_DATA = {
     # American English
     "af_heart": {"grade": "A", "language": "American English", "lang_code": "a"},
     "af_alloy": {"grade": "C", "language": "American English", "lang_code": "a"},
@@ -71,4 +76,6 @@ VOICE_DATA = {
     "pf_dora": {"grade": "N/A", "language": "Brazilian Portuguese", "lang_code": "p"},
     "pm_alex": {"grade": "N/A", "language": "Brazilian Portuguese", "lang_code": "p"},
     "pm_santa": {"grade": "N/A", "language": "Brazilian Portuguese", "lang_code": "p"}
-}
\ No newline at end of file
+}
+
+VOICE_DATA = {name: Voice(**data) for name, data in _VOICE_DATA.items()}